@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+import numpy as np
+
+from graph import Graph, as_graph
+from mst import ENGINES
+
+
+# Batch MST: many independent graphs solved across a process pool.
+#
+# Graphs travel as their int32/float endpoint and weight arrays (pickled as
+# raw buffers), never as tuple lists, and MST edges come back the same way;
+# labels stay in the parent. Graphs are submitted in chunks of chunk_size to
+# amortise the per-task overhead, with at most two chunks per worker in
+# flight so a generator of graphs is consumed lazily.
+
+
+def _pack(graph):
+    return graph.src, graph.dst, graph.weight, graph.num_nodes
+
+
+def _solve_chunk(algorithm, chunk):
+    engine = ENGINES[algorithm]
+    out = []
+    for src, dst, weight, num_nodes in chunk:
+        edges, total = engine(Graph(range(num_nodes), src, dst, weight))
+        u = np.fromiter((e[0] for e in edges), dtype=np.int32, count=len(edges))
+        v = np.fromiter((e[1] for e in edges), dtype=np.int32, count=len(edges))
+        w = np.asarray([e[2] for e in edges], dtype=weight.dtype)
+        out.append((u, v, w, total))
+    return out
+
+
+def _unpack(graph, packed):
+    u, v, w, total = packed
+    labels = graph.labels
+    edges = [(labels[a], labels[b], x) for a, b, x in zip(u.tolist(), v.tolist(), w.tolist())]
+    return edges, total
+
+
+def _as_graphs(graphs):
+    for item in graphs:
+        # (nodes, edges) pairs as well as Graph objects
+        yield as_graph(*item) if isinstance(item, tuple) else as_graph(item)
+
+
+def solve_many(graphs, algorithm="kruskal", workers=None, chunk_size=16, ordered=True):
+    # Yields (index, (mst_edges, total)) for every graph in `graphs`, in
+    # input order, or as soon as each chunk finishes when ordered=False.
+    # workers=1 solves everything in this process. Not a generator itself,
+    # so a bad algorithm name fails here rather than on first iteration.
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown MST algorithm {algorithm!r}; expected one of {', '.join(ENGINES)}")
+    workers = workers or os.cpu_count() or 1
+    return _solve_many(graphs, algorithm, workers, chunk_size, ordered)
+
+
+def _solve_many(graphs, algorithm, workers, chunk_size, ordered):
+    items = enumerate(_as_graphs(graphs))
+
+    if workers <= 1:
+        engine = ENGINES[algorithm]
+        for i, graph in items:
+            yield i, engine(graph)
+        return
+
+    # at most this many graphs submitted past the next one to be yielded;
+    # in ordered mode that also bounds the results buffered behind a slow
+    # early chunk
+    window = 2 * workers * chunk_size
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        finished = {}
+        next_index = 0
+        submitted = 0
+        exhausted = False
+
+        while pending or not exhausted:
+            while (not exhausted and len(pending) < 2 * workers
+                   and (not ordered or submitted - next_index < window)):
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = pool.submit(_solve_chunk, algorithm, [_pack(g) for _, g in chunk])
+                pending[future] = chunk
+                submitted += len(chunk)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                for (i, graph), packed in zip(chunk, future.result()):
+                    result = _unpack(graph, packed)
+                    if ordered:
+                        finished[i] = result
+                    else:
+                        yield i, result
+
+            while next_index in finished:
+                yield next_index, finished.pop(next_index)
+                next_index += 1
+
+
+def mst_many(graphs, algorithm="kruskal", workers=None, chunk_size=16):
+    # list of (mst_edges, total), in input order
+    return [result for _, result in solve_many(graphs, algorithm, workers, chunk_size)]
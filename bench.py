@@ -0,0 +1,496 @@
+import argparse
+import csv
+import gc
+import json
+import multiprocessing
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from generators import FAMILIES, WEIGHT_KINDS, make_graph
+from mst import ENGINES, load_thresholds
+
+
+# Headless benchmark harness. Each data point runs an engine `warmup` times
+# untimed and `repeats` times timed with time.perf_counter_ns; garbage is
+# collected between runs and the collector is off while the clock runs.
+# Every run gets graph.uncached() so each engine pays for its own CSR/sort.
+# Memory is measured in one extra run after the timed ones, so tracing never
+# slows the clock.
+
+DENSE_SPARSE_ENGINES = ("prim", "kruskal")
+
+
+def time_engine(engine, graph, repeats=5, warmup=1):
+    if repeats < 1:
+        raise ValueError(f"repeats must be at least 1, got {repeats!r}")
+    if warmup < 0:
+        raise ValueError(f"warmup must not be negative, got {warmup!r}")
+    for _ in range(warmup):
+        engine(graph.uncached())
+
+    # the collector is left in whatever state the caller had it
+    samples = []
+    enabled = gc.isenabled()
+    try:
+        for _ in range(repeats):
+            run_graph = graph.uncached()
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter_ns()
+            engine(run_graph)
+            samples.append(time.perf_counter_ns() - start)
+            if enabled:
+                gc.enable()
+    finally:
+        if enabled:
+            gc.enable()
+        else:
+            gc.disable()
+    return samples
+
+
+def summarize(samples):
+    ms = sorted(s / 1e6 for s in samples)
+    if len(ms) > 1:
+        q1, _, q3 = statistics.quantiles(ms, n=4, method='inclusive')
+    else:
+        q1 = q3 = ms[0]
+    return {
+        "median_ms": statistics.median(ms),
+        "q1_ms": q1,
+        "q3_ms": q3,
+        "iqr_ms": q3 - q1,
+        "min_ms": ms[0],
+        "repeats": len(ms),
+    }
+
+
+# ---------------- memory ---------------- #
+
+MEMORY_MODES = ("none", "tracemalloc", "rss")
+MB = 1024 * 1024
+
+
+def trace_memory(engine, graph):
+    # tracemalloc sees Python objects and NumPy buffers. peak is the highest
+    # allocation during the run and retained is what is still held when it
+    # returns: the result plus anything cached on the graph. Both are
+    # measured above what was live before, so the input graph is excluded.
+    run_graph = graph.uncached()
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    if tracing and not hasattr(tracemalloc, "reset_peak"):
+        # Python 3.8 has no reset_peak; restarting is the only way to clear
+        # the peak, and tracing is left on afterwards as the caller had it
+        tracemalloc.stop()
+        tracemalloc.start()
+    elif not tracing:
+        tracemalloc.start()
+    try:
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = engine(run_graph)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    del result
+    return {"peak_mb": (peak - base) / MB, "retained_mb": (current - base) / MB}
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _rss_child(name, graph, interval=0.001):
+    # a sampler thread polls RSS while the engine runs; ru_maxrss would also
+    # count the start-up and unpickling peaks of this process
+    gc.collect()
+    before = _rss_bytes()
+    peak = [before]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(interval):
+            peak[0] = max(peak[0], _rss_bytes())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        # the result is held until `after` is sampled, so retained includes it
+        result = ENGINES[name](graph)
+    finally:
+        stop.set()
+        sampler.join()
+    after = _rss_bytes()
+    del result
+    return {"peak_mb": (max(peak[0], after) - before) / MB, "retained_mb": (after - before) / MB}
+
+
+def rss_memory(name, graph):
+    # Resident set size, including what tracemalloc can't see (allocator
+    # slack, C extensions), sampled in a fresh process so earlier runs don't
+    # leave pages behind. Short spikes between samples can be missed.
+    # Linux only.
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_rss_child, name, graph.uncached()).result()
+
+
+def measure_memory(name, graph, mode="tracemalloc"):
+    if mode == "tracemalloc":
+        return trace_memory(ENGINES[name], graph)
+    if mode == "rss":
+        return rss_memory(name, graph)
+    raise ValueError(f"Unknown memory mode {mode!r}; expected one of {', '.join(MEMORY_MODES)}")
+
+
+def _cancelled(cancel):
+    return cancel is not None and cancel.is_set()
+
+
+def _usable(name, num_nodes, matrix_limit):
+    # the matrix engine allocates V x V floats; don't let a sweep blow up
+    return name != "prim_dense" or num_nodes <= matrix_limit
+
+
+def usable_engines(engines, num_nodes, matrix_limit=None):
+    # the engines a point asking for num_nodes nodes times; decided on the
+    # requested count (no family generates more) so callers can count the
+    # rows of a sweep before running it
+    if matrix_limit is None:
+        matrix_limit = load_thresholds()["dense_max_nodes"]
+    return [name for name in engines if _usable(name, num_nodes, matrix_limit)]
+
+
+def _measure(rows, sweep, x, label_suffix, graph, engines, repeats, warmup, on_point, cancel=None,
+             memory="tracemalloc"):
+    for name in engines:
+        if _cancelled(cancel):
+            return
+        row = {
+            "sweep": sweep,
+            "x": x,
+            "engine": name,
+            "label": name.title() + label_suffix,
+            "nodes": graph.num_nodes,
+            "edges": graph.num_edges,
+        }
+        row.update(summarize(time_engine(ENGINES[name], graph, repeats, warmup)))
+        if memory != "none":
+            row.update(measure_memory(name, graph, memory))
+            row["memory"] = memory
+        rows.append(row)
+        if on_point is not None:
+            on_point(row)
+
+
+# ---------------- sweeps ---------------- #
+#
+# A sweep is a list of points (sweep, x, label suffix, family, nodes, edges,
+# weights, seed). Every point is self-contained: with workers > 1 each one
+# is a task that generates its own graph and times the engines one after
+# another, so a worker never runs two timings at once. pin=True gives each
+# worker a core of its own (os.sched_setaffinity) and keeps one core for
+# the caller; workers are capped at the available cores. Seeds are spawned
+# per point, so the graphs, and hence the rows, don't depend on the worker
+# count.
+
+def _point_seeds(seed, count):
+    return np.random.SeedSequence(seed).spawn(count)
+
+
+def _run_point(point, engines, repeats, warmup, memory):
+    sweep, x, suffix, family, n, m, weights, seed = point
+    graph = make_graph(family, n, m, weights, seed)
+    rows = []
+    _measure(rows, sweep, x, suffix, graph, usable_engines(engines, n), repeats, warmup, None, memory=memory)
+    return rows
+
+
+def _pin_worker(cores):
+    # a worker respawned after a crash finds the queue empty and runs
+    # unpinned rather than blocking the pool
+    try:
+        core = cores.get_nowait()
+    except queue.Empty:
+        return
+    os.sched_setaffinity(0, {core})
+
+
+def _run_points(points, engines, repeats, warmup, on_point, cancel, memory, workers=1, pin=False):
+    rows = []
+    if workers <= 1:
+        for sweep, x, suffix, family, n, m, weights, seed in points:
+            if _cancelled(cancel):
+                break
+            graph = make_graph(family, n, m, weights, seed)
+            _measure(rows, sweep, x, suffix, graph, usable_engines(engines, n), repeats, warmup,
+                     on_point, cancel, memory)
+        return rows
+
+    context = multiprocessing.get_context("spawn")
+    options = {}
+    if pin and hasattr(os, "sched_setaffinity"):
+        # the first core is left to the calling process (the GUI, or the
+        # parent collecting results); workers get one each of the rest
+        cores = sorted(os.sched_getaffinity(0))
+        workers = max(1, min(workers, len(cores) - 1))
+        free = context.Queue()
+        for core in cores[1:][:workers]:
+            free.put(core)
+        options = dict(initializer=_pin_worker, initargs=(free,))
+    else:
+        workers = min(workers, os.cpu_count() or 1)
+
+    pool = ProcessPoolExecutor(workers, mp_context=context, **options)
+    # the biggest points go first so none of them is left for last
+    schedule = sorted(range(len(points)), key=lambda i: -points[i][5])
+    futures = {pool.submit(_run_point, points[i], engines, repeats, warmup, memory): i
+               for i in schedule}
+    results = {}
+    try:
+        pending = set(futures)
+        while pending and not _cancelled(cancel):
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = point_rows = future.result()
+                for row in point_rows:
+                    if on_point is not None:
+                        on_point(row)
+    finally:
+        # queued points are dropped, but points already running are waited
+        # for: a new sweep must not pin its workers onto cores that are
+        # still timing. (Future.cancel rather than cancel_futures=, which
+        # needs Python 3.9.)
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+    # merged back into the order a serial sweep produces
+    for i in sorted(results):
+        rows.extend(results[i])
+    return rows
+
+
+def node_sweep(node_counts, num_edges, engines=None, family="uniform", weights="int",
+               seed=None, repeats=5, warmup=1, on_point=None, cancel=None, memory="tracemalloc",
+               workers=1, pin=False):
+    # cancel: optional threading.Event, checked between data points;
+    # memory: one of MEMORY_MODES; workers/pin: see above
+    engines = list(engines or ENGINES)
+    seeds = _point_seeds(seed, len(node_counts))
+    points = [("nodes", n, "", family, n, num_edges, weights, s) for n, s in zip(node_counts, seeds)]
+    return _run_points(points, engines, repeats, warmup, on_point, cancel, memory, workers, pin)
+
+
+def edge_sweep(num_nodes, edge_counts, engines=None, family="uniform", weights="int",
+               seed=None, repeats=5, warmup=1, on_point=None, cancel=None, memory="tracemalloc",
+               workers=1, pin=False):
+    engines = list(engines or ENGINES)
+    seeds = _point_seeds(seed, len(edge_counts))
+    points = [("edges", m, "", family, num_nodes, m, weights, s) for m, s in zip(edge_counts, seeds)]
+    return _run_points(points, engines, repeats, warmup, on_point, cancel, memory, workers, pin)
+
+
+def sweep_rows(node_counts, engines=None):
+    # how many rows a sweep over these per-point node counts reports
+    engines = list(engines or ENGINES)
+    matrix_limit = load_thresholds()["dense_max_nodes"]
+    return sum(len(usable_engines(engines, n, matrix_limit)) for n in node_counts)
+
+
+def dense_sparse_points(max_nodes):
+    step = max(5, max_nodes // 50)
+    return list(range(step, max_nodes + 1, step))
+
+
+def dense_sparse_sweep(max_nodes, engines=DENSE_SPARSE_ENGINES, weights="int",
+                       seed=None, repeats=5, warmup=1, on_point=None, cancel=None, memory="tracemalloc",
+                       workers=1, pin=False):
+    # sparse graphs get n(n-1)/6 edges, dense ones are complete
+    points = []
+    for n in dense_sparse_points(max_nodes):
+        for density, m in (("sparse", n * (n - 1) // 6), ("dense", n * (n - 1) // 2)):
+            points.append((density, n, f" ({density.title()})", "uniform", n, m, weights))
+    seeds = _point_seeds(seed, len(points))
+    points = [point + (s,) for point, s in zip(points, seeds)]
+    return _run_points(points, list(engines), repeats, warmup, on_point, cancel, memory, workers, pin)
+
+
+# ---------------- output ---------------- #
+
+FIELDS = ("sweep", "x", "engine", "label", "nodes", "edges",
+          "median_ms", "q1_ms", "q3_ms", "iqr_ms", "min_ms", "repeats",
+          "memory", "peak_mb", "retained_mb")
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows, path):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def _series(rows):
+    series = {}
+    for row in rows:
+        series.setdefault(row["label"], []).append(row)
+    return series
+
+
+def has_memory(rows):
+    return any("peak_mb" in row for row in rows)
+
+
+def plot_rows(ax, rows, xlabel, title):
+    # one line per label, with the IQR as a shaded band
+    for label, points in _series(rows).items():
+        xs = [p["x"] for p in points]
+        line, = ax.plot(xs, [p["median_ms"] for p in points], marker='o', label=label)
+        ax.fill_between(xs, [p["q1_ms"] for p in points], [p["q3_ms"] for p in points],
+                        color=line.get_color(), alpha=0.2)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Runtime (ms)")
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True)
+
+
+def plot_memory(ax, rows, xlabel, title):
+    # peak as a solid line, retained dashed in the same colour
+    for label, points in _series(rows).items():
+        points = [p for p in points if "peak_mb" in p]
+        if not points:
+            continue
+        xs = [p["x"] for p in points]
+        line, = ax.plot(xs, [p["peak_mb"] for p in points], marker='o', label=f"{label} peak")
+        ax.plot(xs, [p["retained_mb"] for p in points], linestyle='--', color=line.get_color(),
+                label=f"{label} retained")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Memory (MB)")
+    ax.set_title(title)
+    ax.legend(fontsize='small')
+    ax.grid(True)
+
+
+def save_plot(rows, path, xlabel, title):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    if has_memory(rows):
+        fig, (ax, mem_ax) = plt.subplots(1, 2, figsize=(16, 6))
+        plot_memory(mem_ax, rows, xlabel, "Peak / retained memory")
+    else:
+        fig, ax = plt.subplots(figsize=(9, 6))
+    plot_rows(ax, rows, xlabel, title)
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+
+
+# ---------------- command line ---------------- #
+
+def _int_list(text):
+    return [int(x) for x in text.split(',')]
+
+
+def _int_at_least(minimum):
+    def parse(text):
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}")
+        return value
+    return parse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the MST engines without the GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--engines", type=lambda s: s.split(','), default=None,
+                        help=f"comma-separated subset of: {', '.join(ENGINES)}")
+    common.add_argument("--weights", choices=WEIGHT_KINDS, default="int")
+    common.add_argument("--seed", type=int, default=None)
+    common.add_argument("--repeats", type=_int_at_least(1), default=5)
+    common.add_argument("--warmup", type=_int_at_least(0), default=1)
+    common.add_argument("--csv", help="write results to this CSV file")
+    common.add_argument("--json", help="write results to this JSON file")
+    common.add_argument("--plot", help="render the runtime (and memory) plot to this image file")
+    common.add_argument("--memory", choices=MEMORY_MODES, default="tracemalloc",
+                        help="how to measure peak/retained memory per run (rss: fresh process, Linux)")
+    common.add_argument("--quiet", action="store_true")
+    common.add_argument("--workers", type=int, default=1,
+                        help="sweep points timed in parallel processes (one engine per worker at a time)")
+    common.add_argument("--pin", action="store_true", help="pin each worker to its own CPU core")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("node-sweep", parents=[common], help="vary nodes, fixed edges")
+    p.add_argument("--nodes", type=_int_list, required=True, help="e.g. 100,200,400")
+    p.add_argument("--edges", type=int, required=True)
+    p.add_argument("--family", choices=FAMILIES, default="uniform")
+
+    p = sub.add_parser("edge-sweep", parents=[common], help="vary edges, fixed nodes")
+    p.add_argument("--nodes", type=int, required=True)
+    p.add_argument("--edges", type=_int_list, required=True, help="e.g. 1000,2000,4000")
+    p.add_argument("--family", choices=FAMILIES, default="uniform")
+
+    p = sub.add_parser("dense-sparse", parents=[common], help="sparse vs complete graphs up to --max-nodes")
+    p.add_argument("--max-nodes", type=int, required=True)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    for name in args.engines or ():
+        if name not in ENGINES:
+            raise SystemExit(f"Unknown engine {name!r}; expected one of {', '.join(ENGINES)}")
+
+    def report(row):
+        if not args.quiet:
+            memory = f" peak={row['peak_mb']:.2f} MB" if "peak_mb" in row else ""
+            print(f"{row['label']:<28} x={row['x']:<10} median={row['median_ms']:.3f} ms "
+                  f"iqr={row['iqr_ms']:.3f} ms{memory}", file=sys.stderr)
+
+    options = dict(weights=args.weights, seed=args.seed, repeats=args.repeats,
+                   warmup=args.warmup, on_point=report, memory=args.memory,
+                   workers=args.workers, pin=args.pin)
+    if args.command == "node-sweep":
+        rows = node_sweep(args.nodes, args.edges, args.engines, args.family, **options)
+        xlabel, title = "Number of Nodes", f"MST Runtime vs Nodes (Edges fixed = {args.edges}, {args.family})"
+    elif args.command == "edge-sweep":
+        rows = edge_sweep(args.nodes, args.edges, args.engines, args.family, **options)
+        xlabel, title = "Number of Edges", f"MST Runtime vs Edges (Nodes fixed = {args.nodes}, {args.family})"
+    else:
+        rows = dense_sparse_sweep(args.max_nodes, args.engines or DENSE_SPARSE_ENGINES, **options)
+        xlabel, title = "Number of Nodes", "Runtime Comparison: Dense vs Sparse Graphs"
+
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, args.json)
+    if args.plot:
+        save_plot(rows, args.plot, xlabel, title)
+    if not (args.csv or args.json):
+        writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from graph import as_graph
+from profiling import get_profiler
+
+
+def boruvka_indices(src, dst, weight, num_nodes, profiler=None):
+    # Each round every component picks its cheapest outgoing edge (segment
+    # minimum over component labels), then the picked edges are contracted by
+    # pointer jumping. Ties are broken by the stable by-weight rank, so the
+    # result is the same forest kruskal_indices accepts.
+    prof = get_profiler(profiler)
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    m = len(src)
+
+    with prof.phase("sort"):
+        order = np.argsort(weight, kind='stable')
+        rank = np.empty(m, dtype=np.int64)
+        rank[order] = np.arange(m)
+
+    comp = np.arange(num_nodes)
+    alive = np.arange(m)
+    chosen = []
+
+    while alive.size:
+        with prof.phase("cheapest edge"):
+            cu = comp[src[alive]]
+            cv = comp[dst[alive]]
+            crossing = cu != cv
+            alive, cu, cv = alive[crossing], cu[crossing], cv[crossing]
+            if not alive.size:
+                break
+            prof.count("rounds")
+            prof.count("edges_scanned", alive.size)
+
+            best = np.full(num_nodes, m, dtype=np.int64)
+            r = rank[alive]
+            np.minimum.at(best, cu, r)
+            np.minimum.at(best, cv, r)
+
+        with prof.phase("contract"):
+            heads = np.nonzero(best < m)[0]
+            picked = order[best[heads]]
+            ends_u = comp[src[picked]]
+            tails = np.where(ends_u == heads, comp[dst[picked]], ends_u)
+
+            succ = np.arange(num_nodes)
+            succ[heads] = tails
+            # two components that picked each other picked the same edge; the
+            # smaller label becomes the root of the merged component
+            mutual = (succ[tails] == heads) & (heads < tails)
+            succ[heads[mutual]] = heads[mutual]
+            chosen.append(picked[~mutual])
+
+            while True:
+                jumped = succ[succ]
+                prof.count("pointer_jumps")
+                if np.array_equal(jumped, succ):
+                    break
+                succ = jumped
+            comp = succ[comp]
+
+    if not chosen:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(chosen).astype(np.int64)
+
+
+def boruvka_mst(nodes, edges=None, profiler=None):
+    with get_profiler(profiler).phase("build"):
+        graph = as_graph(nodes, edges)
+    ids = boruvka_indices(graph.src, graph.dst, graph.weight, graph.num_nodes, profiler=profiler)
+
+    cost = sum(graph.weight[ids].tolist())
+    return graph.edge_tuples(ids), cost
@@ -1,3 +1,8 @@
+from array import array
+
+import numpy as np
+
+
 class DisjointSetUnion:
     def __init__(self, elements):
         self.parent = {}
@@ -27,4 +32,91 @@ class DisjointSetUnion:
             self.parent[parentY] = parentX
             self.rank[parentX] += 1
 
-        return True
\ No newline at end of file
+        return True
+
+
+class ArrayDisjointSetUnion:
+    # Same operations as DisjointSetUnion, but over the dense ids 0..n-1 and
+    # backed by two contiguous int arrays instead of dicts.
+    def __init__(self, n):
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.components = n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, a):
+        parent = self.parent
+        while parent[a] != a:
+            # path halving: point every other node at its grandparent
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a, b):
+        parentX = self.find(a)
+        parentY = self.find(b)
+
+        if parentX == parentY:
+            return False
+
+        size = self.size
+        if size[parentX] < size[parentY]:
+            parentX, parentY = parentY, parentX
+        self.parent[parentY] = parentX
+        size[parentX] += size[parentY]
+        self.components -= 1
+
+        return True
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def find_many(self, items):
+        if isinstance(items, np.ndarray):
+            # vectorized pointer jumping over a zero-copy view of parent;
+            # no compression, so the structure itself is left untouched
+            parent = np.frombuffer(self.parent, dtype=np.int32)
+            roots = parent[items]
+            while True:
+                up = parent[roots]
+                if np.array_equal(up, roots):
+                    return roots
+                roots = up
+        find = self.find
+        return [find(a) for a in items]
+
+    def union_many(self, pairs):
+        # returns one bool per pair, True where the pair merged two components
+        union = self.union
+        return [union(a, b) for a, b in pairs]
+
+
+class CountingDisjointSetUnion(ArrayDisjointSetUnion):
+    # ArrayDisjointSetUnion that counts its work, for profiling runs only;
+    # the plain class stays free of bookkeeping.
+    def __init__(self, n):
+        super().__init__(n)
+        self.find_calls = 0
+        self.halving_steps = 0
+        self.unions = 0
+
+    def find(self, a):
+        self.find_calls += 1
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+            self.halving_steps += 1
+        return a
+
+    def union(self, a, b):
+        merged = super().union(a, b)
+        self.unions += merged
+        return merged
+
+    def report(self, profiler):
+        profiler.count("find_calls", self.find_calls)
+        profiler.count("path_compression_steps", self.halving_steps)
+        profiler.count("unions", self.unions)
@@ -0,0 +1,331 @@
+import itertools
+
+from kruskal import kruskal_mst
+
+
+class LinkCutTree:
+    # Link-cut tree over nodes 0..n-1 (grows on demand). Every node carries a
+    # value and each splay subtree tracks the node holding its maximum, which
+    # gives path-maximum queries between any two connected nodes.
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.val = []
+        self.top = []
+
+    def add(self, value):
+        x = len(self.val)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.val.append(value)
+        self.top.append(x)
+        return x
+
+    def set_value(self, x, value):
+        self.access(x)
+        self.val[x] = value
+        self._pull(x)
+
+    def _is_root(self, x):
+        p = self.parent[x]
+        return p == -1 or (self.left[p] != x and self.right[p] != x)
+
+    def _push(self, x):
+        if self.flip[x]:
+            left, right = self.left[x], self.right[x]
+            self.left[x], self.right[x] = right, left
+            if left != -1:
+                self.flip[left] = not self.flip[left]
+            if right != -1:
+                self.flip[right] = not self.flip[right]
+            self.flip[x] = False
+
+    def _pull(self, x):
+        val, top = self.val, self.top
+        best = x
+        left, right = self.left[x], self.right[x]
+        if left != -1 and val[top[left]] > val[best]:
+            best = top[left]
+        if right != -1 and val[top[right]] > val[best]:
+            best = top[right]
+        top[x] = best
+
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        if not self._is_root(p):
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+        if left[p] == x:
+            child = right[x]
+            left[p] = child
+            right[x] = p
+        else:
+            child = left[x]
+            right[p] = child
+            left[x] = p
+        if child != -1:
+            parent[child] = p
+        parent[p] = x
+        self._pull(p)
+        self._pull(x)
+
+    def _splay(self, x):
+        # push pending flips top-down along the splay path first
+        path = [x]
+        y = x
+        while not self._is_root(y):
+            y = self.parent[y]
+            path.append(y)
+        for y in reversed(path):
+            self._push(y)
+
+        parent = self.parent
+        while not self._is_root(x):
+            p = parent[x]
+            if not self._is_root(p):
+                g = parent[p]
+                if (self.left[g] == p) == (self.left[p] == x):
+                    self._rotate(p)
+                else:
+                    self._rotate(x)
+            self._rotate(x)
+
+    def access(self, x):
+        last = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self.right[y] = last
+            self._pull(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def make_root(self, x):
+        self.access(x)
+        self.flip[x] = not self.flip[x]
+
+    def find_root(self, x):
+        self.access(x)
+        self._push(x)
+        while self.left[x] != -1:
+            x = self.left[x]
+            self._push(x)
+        self._splay(x)
+        return x
+
+    def connected(self, x, y):
+        return x == y or self.find_root(x) == self.find_root(y)
+
+    def link(self, x, y):
+        self.make_root(x)
+        self.parent[x] = y
+
+    def cut(self, x, y):
+        self.make_root(x)
+        self.access(y)
+        # x is now y's left child with nothing between them
+        self.left[y] = -1
+        self.parent[x] = -1
+        self._pull(y)
+
+    def path_max(self, x, y):
+        self.make_root(x)
+        self.access(y)
+        return self.top[y]
+
+
+class DynamicMST:
+    # Minimum spanning forest under edge insertions, deletions and weight
+    # changes. Tree edges live in a link-cut tree as extra nodes carrying
+    # their weight, so an insert finds the heaviest edge on the cycle it
+    # closes with one O(log n) path-maximum query. Deleting a tree edge walks
+    # both halves of the cut in lockstep and stops when the smaller one is
+    # exhausted; the replacement is the lightest non-tree edge leaving it.
+    def __init__(self, nodes, edges, mst_edges=None):
+        if mst_edges is None:
+            mst_edges, _ = kruskal_mst(nodes, edges)
+
+        self.lct = LinkCutTree()
+        self.vertex = {}
+        self.edges = {}
+        self.tree_adj = {}
+        self.non_tree_adj = {}
+        self._node_edge = {}
+        self.total = 0
+        self._seq = itertools.count()
+
+        for x in nodes:
+            self._vertex(x)
+
+        tree_keys = set()
+        for u, v, w in mst_edges:
+            tree_keys.add(self._key(u, v))
+        for u, v, w in edges:
+            key = self._key(u, v)
+            if key in self.edges:
+                raise ValueError(f"Duplicate edge {u!r}-{v!r}")
+            self._vertex(u)
+            self._vertex(v)
+            record = self.edges[key] = [u, v, w, None, next(self._seq)]
+            if key in tree_keys:
+                self._link(record, key)
+            else:
+                self._add_non_tree(record, key)
+
+    @staticmethod
+    def _key(u, v):
+        return frozenset((u, v))
+
+    def _vertex(self, x):
+        node = self.vertex.get(x)
+        if node is None:
+            node = self.vertex[x] = self.lct.add(float('-inf'))
+            self.tree_adj[x] = set()
+            self.non_tree_adj[x] = set()
+        return node
+
+    def _link(self, record, key):
+        u, v, w = record[0], record[1], record[2]
+        node = self.lct.add(w)
+        self._node_edge[node] = key
+        record[3] = node
+        self.lct.link(self.vertex[u], node)
+        self.lct.link(node, self.vertex[v])
+        self.tree_adj[u].add(v)
+        self.tree_adj[v].add(u)
+        self.total += w
+
+    def _cut(self, record):
+        u, v, w, node = record[0], record[1], record[2], record[3]
+        self.lct.cut(self.vertex[u], node)
+        self.lct.cut(node, self.vertex[v])
+        del self._node_edge[node]
+        record[3] = None
+        self.tree_adj[u].discard(v)
+        self.tree_adj[v].discard(u)
+        self.total -= w
+
+    def _add_non_tree(self, record, key):
+        self.non_tree_adj[record[0]].add(key)
+        self.non_tree_adj[record[1]].add(key)
+
+    def _remove_non_tree(self, record, key):
+        self.non_tree_adj[record[0]].discard(key)
+        self.non_tree_adj[record[1]].discard(key)
+
+    def _walk(self, start):
+        seen = {start}
+        stack = [start]
+        while stack:
+            x = stack.pop()
+            yield seen
+            for y in self.tree_adj[x]:
+                if y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+
+    def _smaller_side(self, u, v):
+        # alternate one step on each side; the first walk to finish has
+        # visited every vertex of the smaller half
+        walks = (self._walk(u), self._walk(v))
+        sides = [None, None]
+        while True:
+            for i in (0, 1):
+                seen = next(walks[i], None)
+                if seen is None:
+                    return sides[i]
+                sides[i] = seen
+
+    def _lookup(self, u, v):
+        try:
+            return self.edges[self._key(u, v)]
+        except KeyError:
+            raise KeyError(f"No edge {u!r}-{v!r}")
+
+    def insert_edge(self, u, v, w):
+        key = self._key(u, v)
+        if key in self.edges:
+            raise ValueError(f"Edge {u!r}-{v!r} already exists; use update_weight")
+        a, b = self._vertex(u), self._vertex(v)
+        record = self.edges[key] = [u, v, w, None, next(self._seq)]
+
+        if u == v:
+            self._add_non_tree(record, key)
+            return False
+
+        if not self.lct.connected(a, b):
+            self._link(record, key)
+            return True
+
+        heaviest_key = self._node_edge[self.lct.path_max(a, b)]
+        heaviest = self.edges[heaviest_key]
+        if w < heaviest[2]:
+            self._cut(heaviest)
+            self._add_non_tree(heaviest, heaviest_key)
+            self._link(record, key)
+            return True
+
+        self._add_non_tree(record, key)
+        return False
+
+    def delete_edge(self, u, v):
+        key = self._key(u, v)
+        record = self._lookup(u, v)
+        del self.edges[key]
+
+        if record[3] is None:
+            self._remove_non_tree(record, key)
+            return
+
+        self._cut(record)
+        side = self._smaller_side(u, v)
+        best = None
+        for x in side:
+            for other in self.non_tree_adj[x]:
+                candidate = self.edges[other]
+                y = candidate[1] if candidate[0] == x else candidate[0]
+                if y in side:
+                    continue
+                if best is None or (candidate[2], candidate[4]) < (best[2], best[4]):
+                    best = candidate
+        if best is not None:
+            best_key = self._key(best[0], best[1])
+            self._remove_non_tree(best, best_key)
+            self._link(best, best_key)
+
+    def update_weight(self, u, v, w):
+        record = self._lookup(u, v)
+        old = record[2]
+        if w == old:
+            return
+
+        if record[3] is not None and w < old:
+            # a tree edge that gets lighter stays in the tree
+            self.lct.set_value(record[3], w)
+            record[2] = w
+            self.total += w - old
+            return
+
+        if record[3] is None and w > old:
+            # a non-tree edge that gets heavier stays out of it
+            record[2] = w
+            return
+
+        self.delete_edge(u, v)
+        self.insert_edge(u, v, w)
+
+    def mst_edges(self):
+        return [(r[0], r[1], r[2]) for r in self.edges.values() if r[3] is not None]
+
+    def __len__(self):
+        return len(self.edges)
@@ -0,0 +1,197 @@
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+from array import array
+from operator import itemgetter
+
+import numpy as np
+
+from dsu import ArrayDisjointSetUnion
+from utils import iter_edge_lines, parse_edge_line
+
+
+# Out-of-core Kruskal for edge files larger than RAM.
+#
+#   1. The file is parsed in runs of at most memory_budget bytes of edges.
+#      Each run is sorted by weight (stable) and written to a temp file.
+#   2. The runs are k-way merged with heapq.merge, at most MAX_FAN_IN at a
+#      time (extra passes merge groups of runs into longer ones first).
+#      Ties keep file order, so the result matches kruskal_mst. Merged edges stream through an
+#      ArrayDisjointSetUnion, and accepted edges are written out as they
+#      are found.
+#
+# Only the node labels and the DSU are O(V); edges never all sit in memory.
+
+MB = 1024 * 1024
+DEFAULT_MEMORY_BUDGET = 256 * MB
+
+RUN_DTYPE = np.dtype([('w', '<f8'), ('u', '<i4'), ('v', '<i4')])
+# parsed arrays (4 + 4 + 8) plus the sort permutation and the sorted record
+# copy while a run is written
+RUN_BYTES_PER_EDGE = 16 + 8 + RUN_DTYPE.itemsize
+# most run files open at once during a merge; more runs take extra passes
+MAX_FAN_IN = 256
+MIN_MEMORY_MB = 1
+
+
+def _write_run(src, dst, weights, directory, runs):
+    weight = np.frombuffer(weights, dtype=np.float64)
+    order = np.argsort(weight, kind='stable')
+    records = np.empty(len(order), dtype=RUN_DTYPE)
+    records['w'] = weight[order]
+    records['u'] = np.frombuffer(src, dtype=np.int32)[order]
+    records['v'] = np.frombuffer(dst, dtype=np.int32)[order]
+    path = os.path.join(directory, f"run{len(runs):05d}.bin")
+    records.tofile(path)
+    runs.append(path)
+
+
+def sort_runs(path, directory, memory_budget=DEFAULT_MEMORY_BUDGET, chunk_size=1 << 20):
+    # Phase 1: returns (labels, run file paths, number of edges)
+    run_edges = max(1, memory_budget // RUN_BYTES_PER_EDGE)
+    index = {}
+    labels = []
+
+    def intern(label):
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(labels)
+            labels.append(label)
+        return i
+
+    runs = []
+    num_edges = 0
+    src, dst, weights = array('i'), array('i'), array('d')
+    for i, line in iter_edge_lines(path, chunk_size):
+        parse_edge_line(i, line, intern, src, dst, weights)
+        if len(weights) >= run_edges:
+            num_edges += len(weights)
+            _write_run(src, dst, weights, directory, runs)
+            src, dst, weights = array('i'), array('i'), array('d')
+    if weights:
+        num_edges += len(weights)
+        _write_run(src, dst, weights, directory, runs)
+    return labels, runs, num_edges
+
+
+def _read_run(path, block):
+    # yields (w, u, v) tuples, reading `block` records at a time
+    with open(path, 'rb') as f:
+        while True:
+            records = np.fromfile(f, dtype=RUN_DTYPE, count=block)
+            if not len(records):
+                return
+            yield from zip(records['w'].tolist(), records['u'].tolist(), records['v'].tolist())
+
+
+def _merge(runs, block):
+    return heapq.merge(*(_read_run(run, block) for run in runs), key=itemgetter(0))
+
+
+def _write_merged(runs, path, block):
+    # merges `runs` into one run file, `block` records per write
+    with open(path, 'wb') as f:
+        buffer = []
+        for edge in _merge(runs, block):
+            buffer.append(edge)
+            if len(buffer) == block:
+                np.array(buffer, dtype=RUN_DTYPE).tofile(f)
+                buffer = []
+        if buffer:
+            np.array(buffer, dtype=RUN_DTYPE).tofile(f)
+
+
+def merge_runs(runs, directory, memory_budget=DEFAULT_MEMORY_BUDGET, fan_in=MAX_FAN_IN):
+    # Phase 2: one globally sorted stream of (w, u, v). At most fan_in runs
+    # are open at once: while there are more, consecutive groups are merged
+    # into intermediate runs (consecutive, so ties still keep file order).
+    # Every open run, and the writer, gets an equal share of the budget.
+    passes = 0
+    while len(runs) > fan_in:
+        block = max(64, memory_budget // ((fan_in + 1) * RUN_DTYPE.itemsize))
+        merged = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            path = os.path.join(directory, f"pass{passes}-{len(merged):05d}.bin")
+            _write_merged(group, path, block)
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        runs = merged
+        passes += 1
+    block = max(64, memory_budget // (max(1, len(runs)) * RUN_DTYPE.itemsize))
+    return _merge(runs, block), passes
+
+
+def external_kruskal(path, out_path, memory_budget=DEFAULT_MEMORY_BUDGET, tmp_dir=None,
+                     chunk_size=1 << 20, info=None, fan_in=MAX_FAN_IN):
+    # Writes the minimum spanning forest of the edge list at `path` to
+    # `out_path` as "nodeA nodeB weight" lines, in acceptance order.
+    # memory_budget (bytes) bounds the edge buffers of both phases.
+    # Returns (number of MST edges, total weight); info, if given, also gets
+    # the node/edge/run counts.
+    if memory_budget <= 0:
+        raise ValueError(f"memory_budget must be positive, got {memory_budget!r}")
+    if fan_in < 2:
+        raise ValueError(f"fan_in must be at least 2, got {fan_in!r}")
+    with tempfile.TemporaryDirectory(prefix="mst-runs-", dir=tmp_dir) as directory:
+        labels, runs, num_edges = sort_runs(path, directory, memory_budget, chunk_size)
+
+        n = len(labels)
+        dsu = ArrayDisjointSetUnion(n)
+        union = dsu.union
+        target = n - 1
+        count = 0
+        total = 0
+        merged, passes = merge_runs(runs, directory, memory_budget, fan_in)
+
+        with open(out_path, 'w', encoding='utf-8') as out:
+            write = out.write
+            if target > 0:
+                for w, u, v in merged:
+                    if union(u, v):
+                        write(f"{labels[u]} {labels[v]} {w!r}\n")
+                        count += 1
+                        total = total + w
+                        if count == target:
+                            break
+
+    if info is not None:
+        info["nodes"] = n
+        info["edges"] = num_edges
+        info["runs"] = len(runs)
+        info["merge_passes"] = passes
+        info["components"] = dsu.components
+    return count, total
+
+
+def _memory_mb(text):
+    value = int(text)
+    if value < MIN_MEMORY_MB:
+        raise argparse.ArgumentTypeError(f"must be at least {MIN_MEMORY_MB}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kruskal's MST for edge lists larger than memory.")
+    parser.add_argument("edges", help="edge list file (nodeA nodeB weight per line)")
+    parser.add_argument("output", help="file to write the MST edges to")
+    parser.add_argument("--memory-mb", type=_memory_mb, default=DEFAULT_MEMORY_BUDGET // MB,
+                        help=f"memory budget for edge buffers, in MiB (at least {MIN_MEMORY_MB})")
+    parser.add_argument("--tmp-dir", default=None, help="where to put the sorted runs")
+    args = parser.parse_args(argv)
+
+    info = {}
+    count, total = external_kruskal(args.edges, args.output, args.memory_mb * MB, args.tmp_dir, info=info)
+    print(f"Nodes={info['nodes']}, Edges={info['edges']}, runs={info['runs']}, "
+          f"merge passes={info['merge_passes']}, components={info['components']}", file=sys.stderr)
+    print(f"MST edges: {count}, total weight: {total:g}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
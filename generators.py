@@ -0,0 +1,179 @@
+import math
+
+import numpy as np
+
+from graph import Graph
+from grid import cell_pairs
+from utils import sample_pairs
+
+
+# Structured graph families for benchmarking. Every generator is vectorized,
+# takes a seed (int or np.random.Generator) and returns a Graph whose labels
+# are str(i). `weights` picks one of WEIGHT_KINDS.
+
+WEIGHT_KINDS = ("int", "uniform", "ties", "equal")
+
+
+def make_weights(kind, m, rng):
+    if kind == "int":
+        return rng.integers(1, 21, size=m)
+    if kind == "uniform":
+        return rng.random(m)
+    if kind == "ties":
+        return rng.integers(1, 4, size=m).astype(np.float64)
+    if kind == "equal":
+        return np.ones(m)
+    raise ValueError(f"Unknown weight kind {kind!r}; expected one of {', '.join(WEIGHT_KINDS)}")
+
+
+def _graph(n, src, dst, weights, rng):
+    src = np.asarray(src, dtype=np.int32)
+    dst = np.asarray(dst, dtype=np.int32)
+    return Graph([str(i) for i in range(n)], src, dst, make_weights(weights, len(src), rng))
+
+
+def _dedupe(src, dst):
+    # drop self-loops and repeated unordered pairs, keeping first occurrences
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+    _, first = np.unique(lo * (hi.max(initial=0) + 1) + hi, return_index=True)
+    first.sort()
+    return src[first], dst[first]
+
+
+def uniform_graph(num_nodes, num_edges, weights="int", seed=None):
+    rng = np.random.default_rng(seed)
+    src, dst = sample_pairs(num_nodes, num_edges, rng)
+    return _graph(num_nodes, src, dst, weights, rng)
+
+
+def grid_graph(rows, cols, weights="int", seed=None):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows * cols).reshape(rows, cols)
+    src = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    dst = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    return _graph(rows * cols, src, dst, weights, rng)
+
+
+def geometric_graph(num_nodes, radius, weights="uniform", seed=None):
+    # points uniform in the unit square, joined when closer than radius;
+    # candidates come from the 3x3 block of cells of side radius
+    rng = np.random.default_rng(seed)
+    points = rng.random((num_nodes, 2))
+    cells_per_side = max(1, int(1 / radius)) if radius > 0 else 1
+    cell = np.minimum((points * cells_per_side).astype(np.int64), cells_per_side - 1)
+    src, dst, _, _ = cell_pairs(cell, cells_per_side)
+    keep = np.sum((points[src] - points[dst]) ** 2, axis=1) <= radius * radius
+    return _graph(num_nodes, src[keep], dst[keep], weights, rng)
+
+
+def barabasi_albert_graph(num_nodes, attach, weights="int", seed=None):
+    # Batagelj-Brandes preferential attachment. Slot 2k holds the new node of
+    # edge k and slot 2k+1 copies a uniformly chosen earlier slot; the copy
+    # chains are resolved by pointer jumping instead of a sequential loop.
+    rng = np.random.default_rng(seed)
+    attach = max(1, min(attach, num_nodes - 1))
+    m = num_nodes * attach
+    slots = np.empty(2 * m, dtype=np.int64)
+    slots[0::2] = np.repeat(np.arange(num_nodes), attach)
+
+    positions = np.arange(0, 2 * m, 2)
+    pick = (rng.random(m) * (positions + 1)).astype(np.int64)
+    while True:
+        odd = pick % 2 == 1
+        if not odd.any():
+            break
+        pick[odd] = pick[(pick[odd] - 1) // 2]
+    slots[1::2] = slots[pick]
+
+    src, dst = _dedupe(slots[0::2], slots[1::2])
+    return _graph(num_nodes, src, dst, weights, rng)
+
+
+def path_graph(num_nodes, weights="int", seed=None, shuffle=True):
+    # one long chain; with shuffle the vertex ids along it are a random
+    # permutation, which is the worst case for union-find depth
+    rng = np.random.default_rng(seed)
+    ids = rng.permutation(num_nodes) if shuffle else np.arange(num_nodes)
+    return _graph(num_nodes, ids[:-1], ids[1:], weights, rng)
+
+
+def caterpillar_graph(spine, legs, weights="int", seed=None):
+    rng = np.random.default_rng(seed)
+    n = spine * (legs + 1)
+    body = np.arange(spine)
+    feet = spine + np.arange(spine * legs)
+    src = np.concatenate((body[:-1], np.repeat(body, legs)))
+    dst = np.concatenate((body[1:], feet))
+    return _graph(n, src, dst, weights, rng)
+
+
+def components_graph(num_components, nodes_per_component, edges_per_component, weights="int", seed=None):
+    rng = np.random.default_rng(seed)
+    k, size = num_components, nodes_per_component
+    per = min(edges_per_component, size * (size - 1) // 2)
+    src_parts, dst_parts = [], []
+    for c in range(k):
+        src, dst = sample_pairs(size, per, rng)
+        src_parts.append(src.astype(np.int64) + c * size)
+        dst_parts.append(dst.astype(np.int64) + c * size)
+    src = np.concatenate(src_parts) if src_parts else np.empty(0, dtype=np.int64)
+    dst = np.concatenate(dst_parts) if dst_parts else np.empty(0, dtype=np.int64)
+    return _graph(k * size, src, dst, weights, rng)
+
+
+# ---------------- (nodes, edges) adapters ---------------- #
+#
+# The GUI and the experiments only ask for "about n nodes and m edges", so
+# each family maps that request onto its own parameters.
+
+def _grid(n, m, weights, seed):
+    rows = max(1, int(math.sqrt(n)))
+    return grid_graph(rows, max(1, n // rows), weights, seed)
+
+
+def _geometric(n, m, weights, seed):
+    # expected edges ~ n^2 * pi r^2 / 2
+    radius = math.sqrt(2 * m / (math.pi * n * n)) if n else 0.0
+    return geometric_graph(n, min(radius, 1.5), weights, seed)
+
+
+def _power_law(n, m, weights, seed):
+    return barabasi_albert_graph(n, max(1, round(m / max(1, n))), weights, seed)
+
+
+def _path(n, m, weights, seed):
+    return path_graph(n, weights, seed)
+
+
+def _caterpillar(n, m, weights, seed):
+    legs = 3
+    return caterpillar_graph(max(1, n // (legs + 1)), legs, weights, seed)
+
+
+def _components(n, m, weights, seed):
+    k = max(1, int(math.sqrt(n)))
+    size = max(2, n // k)
+    return components_graph(k, size, max(1, m // k), weights, seed)
+
+
+FAMILIES = {
+    "uniform": uniform_graph,
+    "grid": _grid,
+    "geometric": _geometric,
+    "power_law": _power_law,
+    "path": _path,
+    "caterpillar": _caterpillar,
+    "components": _components,
+}
+
+
+def make_graph(family, num_nodes, num_edges, weights="int", seed=None):
+    try:
+        generator = FAMILIES[family]
+    except KeyError:
+        raise ValueError(f"Unknown graph family {family!r}; expected one of {', '.join(FAMILIES)}")
+    return generator(num_nodes, num_edges, weights, seed)
@@ -0,0 +1,182 @@
+import json
+import os
+
+import numpy as np
+
+
+class Graph:
+    # Undirected weighted graph with node labels interned to ids 0..n-1.
+    # Edges live in three parallel arrays; the CSR adjacency and the
+    # by-weight edge order are derived on first use and cached.
+    def __init__(self, labels, src, dst, weight):
+        # a label array (e.g. memory-mapped from a saved graph) is kept as is
+        self.labels = labels if isinstance(labels, np.ndarray) else list(labels)
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        self.weight = np.asarray(weight)
+        if self.weight.dtype.kind not in 'iuf':
+            self.weight = self.weight.astype(np.float64)
+        self._index = None
+        self._csr = None
+        self._order = None
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        index = {}
+        labels = []
+        for x in nodes:
+            if x not in index:
+                index[x] = len(labels)
+                labels.append(x)
+
+        m = len(edges)
+        src = np.empty(m, dtype=np.int32)
+        dst = np.empty(m, dtype=np.int32)
+        weights = []
+        for i, (u, v, w) in enumerate(edges):
+            if u not in index:
+                index[u] = len(labels)
+                labels.append(u)
+            if v not in index:
+                index[v] = len(labels)
+                labels.append(v)
+            src[i] = index[u]
+            dst[i] = index[v]
+            weights.append(w)
+
+        graph = cls(labels, src, dst, weights if m else np.empty(0, dtype=np.float64))
+        graph._index = index
+        return graph
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {x: i for i, x in enumerate(self.labels)}
+        return self._index
+
+    def csr(self):
+        # (offsets, neighbors, weights, edge_ids); every undirected edge is
+        # stored once in each direction.
+        if self._csr is None:
+            n, m = self.num_nodes, self.num_edges
+            heads = np.concatenate((self.src, self.dst))
+            tails = np.concatenate((self.dst, self.src))
+            edge_ids = np.concatenate((np.arange(m, dtype=np.int32),) * 2)
+            perm = np.argsort(heads, kind='stable')
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(heads, minlength=n), out=offsets[1:])
+            self._csr = (offsets, tails[perm], self.weight[edge_ids[perm]], edge_ids[perm])
+        return self._csr
+
+    def uncached(self):
+        # same arrays, none of the derived structures; lets each engine in a
+        # timing run pay for its own CSR / sort
+        return Graph(self.labels, self.src, self.dst, self.weight)
+
+    def sorted_order(self):
+        # edge ids by ascending weight, ties kept in input order
+        if self._order is None:
+            self._order = np.argsort(self.weight, kind='stable')
+        return self._order
+
+    def edge_tuples(self, ids=None):
+        labels = self.labels
+        if ids is None:
+            src, dst, weight = self.src, self.dst, self.weight
+        else:
+            src, dst, weight = self.src[ids], self.dst[ids], self.weight[ids]
+        return [(labels[u], labels[v], w) for u, v, w in zip(src.tolist(), dst.tolist(), weight.tolist())]
+
+    def __len__(self):
+        return self.num_edges
+
+    def __repr__(self):
+        return f"Graph(nodes={self.num_nodes}, edges={self.num_edges})"
+
+
+def as_graph(nodes, edges=None):
+    if isinstance(nodes, Graph):
+        return nodes
+    return Graph.from_edges(nodes, edges)
+
+
+# ---------------- binary graph files ---------------- #
+#
+# A saved graph is a directory of .npy files plus meta.json. Loading maps the
+# arrays with np.load(mmap_mode='r'), so opening one costs a few page faults
+# no matter how many edges it has. meta.json is written last and marks the
+# directory as complete.
+
+GRAPH_FORMAT_VERSION = 1
+_CSR_FILES = ("csr_offsets", "csr_neighbors", "csr_weights", "csr_edge_ids")
+
+
+def _label_array(labels):
+    array = np.asarray(labels) if len(labels) else np.empty(0, dtype=str)
+    if array.dtype.kind not in 'iuU':
+        array = np.asarray([str(x) for x in labels])
+    return array
+
+
+def save_graph(graph, path, with_csr=True, with_order=True, source_hash=None):
+    os.makedirs(path, exist_ok=True)
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    np.save(os.path.join(path, "labels.npy"), _label_array(graph.labels))
+    np.save(os.path.join(path, "src.npy"), graph.src)
+    np.save(os.path.join(path, "dst.npy"), graph.dst)
+    np.save(os.path.join(path, "weight.npy"), graph.weight)
+    if with_csr:
+        for name, array in zip(_CSR_FILES, graph.csr()):
+            np.save(os.path.join(path, name + ".npy"), array)
+    if with_order:
+        np.save(os.path.join(path, "order.npy"), graph.sorted_order())
+
+    meta = {
+        "version": GRAPH_FORMAT_VERSION,
+        "num_nodes": graph.num_nodes,
+        "num_edges": graph.num_edges,
+        "csr": bool(with_csr),
+        "order": bool(with_order),
+        "source_hash": source_hash,
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def read_graph_meta(path):
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get("version") != GRAPH_FORMAT_VERSION:
+        return None
+    return meta
+
+
+def load_graph(path, mmap=True):
+    meta = read_graph_meta(path)
+    if meta is None:
+        raise ValueError(f"{path!r} is not a saved graph (missing or outdated meta.json)")
+    mode = 'r' if mmap else None
+
+    def load(name):
+        return np.load(os.path.join(path, name + ".npy"), mmap_mode=mode)
+
+    graph = Graph(load("labels"), load("src"), load("dst"), load("weight"))
+    if meta["csr"]:
+        graph._csr = tuple(load(name) for name in _CSR_FILES)
+    if meta["order"]:
+        graph._order = load("order")
+    return graph
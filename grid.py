@@ -0,0 +1,35 @@
+import numpy as np
+
+
+# Uniform-grid neighbour search shared by the force layout (short-range
+# repulsion) and the geometric graph generator (pairs within a radius).
+
+_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def cell_pairs(cell, cells_per_side):
+    # every pair (a, b) of points in the same or adjacent cells of a square
+    # grid, each once; cell is an (n, 2) array of integer cell coordinates.
+    # Also returns each point's flat cell id and the per-cell counts.
+    cell_id = cell[:, 0] * cells_per_side + cell[:, 1]
+    order = np.argsort(cell_id, kind='stable')
+    counts = np.bincount(cell_id, minlength=cells_per_side ** 2)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    a_parts, b_parts = [], []
+    # half of the neighbourhood, so every pair of cells is visited once
+    for dx, dy in _NEIGHBOURS:
+        nx, ny = cell[:, 0] + dx, cell[:, 1] + dy
+        valid = (nx >= 0) & (nx < cells_per_side) & (ny >= 0) & (ny < cells_per_side)
+        a = np.nonzero(valid)[0]
+        other = nx[a] * cells_per_side + ny[a]
+        reps = counts[other]
+        a = np.repeat(a, reps)
+        offsets = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+        b = order[np.repeat(starts[other], reps) + offsets]
+        if dx == 0 and dy == 0:
+            keep = a < b
+            a, b = a[keep], b[keep]
+        a_parts.append(a)
+        b_parts.append(b)
+    return np.concatenate(a_parts), np.concatenate(b_parts), cell_id, counts
@@ -1,15 +1,27 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import random, time
+import os, queue, random, threading, time
 
-from kruskal import kruskal_mst
-from prims import prim_mst
-from utils import parse_edge_list, draw_graph, SAMPLE_GRAPH
-from utils import generate_random_graph
+from mst import ENGINES
+from bench import node_sweep, edge_sweep, dense_sparse_sweep, dense_sparse_points, sweep_rows, DENSE_SPARSE_ENGINES, plot_rows, plot_memory
+from cache import MSTCache
+from profiling import Profiler
+from utils import parse_edge_list, load_edge_file, draw_graph, node_positions, non_mst_edge_ids, SAMPLE_GRAPH
+from generators import FAMILIES, WEIGHT_KINDS, make_graph
 
 
+# loaded files with more edges than this hand draw_graph a sample (plus the
+# MST) rather than converting every edge; the result pane lists at most
+# MAX_LISTED_EDGES MST edges
+MAX_DRAWN_EDGES = 20000
+MAX_LISTED_EDGES = 1000
+# experiment sweeps time their points in this many pinned worker processes,
+# leaving one core to the GUI
+SWEEP_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
 
 class MSTApp:
     def __init__(self, root):
@@ -28,8 +40,16 @@ class MSTApp:
         # ---------------- Feature 1 ----------------#
         ttk.Label(frm_controls, text="Algorithm:").grid(row=0, column=0, sticky='w')
         self.alg_var = tk.StringVar(value="kruskal")
-        alg_menu = ttk.OptionMenu(frm_controls, self.alg_var, "kruskal", "kruskal", "prim")
-        alg_menu.grid(row=1, column=0, sticky='we', pady=(0,8))
+        frm_alg = ttk.Frame(frm_controls)
+        frm_alg.grid(row=1, column=0, sticky='we', pady=(0,8))
+        frm_alg.columnconfigure(0, weight=1)
+        alg_menu = ttk.OptionMenu(frm_alg, self.alg_var, "kruskal", *ENGINES)
+        alg_menu.grid(row=0, column=0, sticky='we')
+        # per-phase timings and counters in the result pane; profiled runs
+        # skip the cache lookup
+        self.profile_var = tk.BooleanVar(value=False)
+        self.profile_enabled = False
+        ttk.Checkbutton(frm_alg, text="Profile", variable=self.profile_var).grid(row=0, column=1, padx=(6,0))
 
         ttk.Label(frm_controls, text="Edge list (nodeA nodeB weight):").grid(row=2, column=0, sticky='w')
         self.input_area = scrolledtext.ScrolledText(frm_controls, width=36, height=12)
@@ -38,15 +58,16 @@ class MSTApp:
 
         ttk.Button(frm_controls, text="Run", command=self.run_algorithm).grid(row=4, column=0, sticky='we', pady=(8,0))
         ttk.Button(frm_controls, text="Clear", command=lambda: self.input_area.delete('1.0','end')).grid(row=5, column=0, sticky='we', pady=(4,0))
+        ttk.Button(frm_controls, text="Load file…", command=self.run_file).grid(row=6, column=0, sticky='we', pady=(4,0))
 
-        ttk.Label(frm_controls, text="Result:").grid(row=6, column=0, sticky='w', pady=(8,0))
+        ttk.Label(frm_controls, text="Result:").grid(row=7, column=0, sticky='w', pady=(8,0))
         self.result_area = scrolledtext.ScrolledText(frm_controls, width=36, height=10, state='disabled')
-        self.result_area.grid(row=7, column=0, sticky='nswe')
+        self.result_area.grid(row=8, column=0, sticky='nswe')
 
         # ---------------- Feature 2----------------#
-        ttk.Label(frm_controls, text="\nRandom Graph Generator").grid(row=8, column=0, sticky='w')
+        ttk.Label(frm_controls, text="\nRandom Graph Generator").grid(row=9, column=0, sticky='w')
 
-        row = 9
+        row = 10
         ttk.Label(frm_controls, text="Nodes:").grid(row=row, column=0, sticky='w'); row += 1
         self.rand_nodes_entry = ttk.Entry(frm_controls)
         self.rand_nodes_entry.grid(row=row, column=0, sticky='we'); row += 1
@@ -55,6 +76,12 @@ class MSTApp:
         self.rand_edges_entry = ttk.Entry(frm_controls)
         self.rand_edges_entry.grid(row=row, column=0, sticky='we'); row += 1
 
+        ttk.Label(frm_controls, text="Family / Weights:").grid(row=row, column=0, sticky='w'); row += 1
+        self.rand_family = tk.StringVar(value="uniform")
+        ttk.OptionMenu(frm_controls, self.rand_family, "uniform", *FAMILIES).grid(row=row, column=0, sticky='we'); row += 1
+        self.rand_weights = tk.StringVar(value="int")
+        ttk.OptionMenu(frm_controls, self.rand_weights, "int", *WEIGHT_KINDS).grid(row=row, column=0, sticky='we'); row += 1
+
         ttk.Button(frm_controls, text="Generate Random Graph", command=self.run_random_graph).grid(row=row, column=0, sticky='we', pady=6)
         row += 1
 
@@ -88,6 +115,17 @@ class MSTApp:
         self.series_edges_entry.grid(row=row, column=0, sticky='we')
         row += 1
 
+        ttk.Label(frm_controls, text="Family / Weights:").grid(row=row, column=0, sticky='w')
+        row += 1
+
+        self.series_family = tk.StringVar(value="uniform")
+        ttk.OptionMenu(frm_controls, self.series_family, "uniform", *FAMILIES).grid(row=row, column=0, sticky='we')
+        row += 1
+
+        self.series_weights = tk.StringVar(value="int")
+        ttk.OptionMenu(frm_controls, self.series_weights, "int", *WEIGHT_KINDS).grid(row=row, column=0, sticky='we')
+        row += 1
+
         ttk.Button(
             frm_controls,
             text="Run Experiment",
@@ -110,6 +148,25 @@ class MSTApp:
         ).grid(row=row, column=0, sticky='we', pady=6)
         row += 1
 
+        #--------------- Background job status ---------------#
+        self.status_var = tk.StringVar(value="Idle")
+        ttk.Label(frm_controls, textvariable=self.status_var).grid(row=row, column=0, sticky='w')
+        row += 1
+
+        self.progress = ttk.Progressbar(frm_controls, mode='determinate')
+        self.progress.grid(row=row, column=0, sticky='we')
+        row += 1
+
+        self.cancel_button = ttk.Button(frm_controls, text="Cancel", command=self.cancel_job, state='disabled')
+        self.cancel_button.grid(row=row, column=0, sticky='we', pady=(4,0))
+        row += 1
+
+        self.job = None
+
+        # repeated Run clicks on an unchanged graph are answered from here;
+        # the timing experiments bypass it
+        self.mst_cache = MSTCache()
+
         # ---------------- MST Graph Canvas---------------- #
         self.fig, self.ax = plt.subplots(figsize=(5,5))
         self.canvas = FigureCanvasTkAgg(self.fig, master=frm_canvas)
@@ -124,6 +181,114 @@ class MSTApp:
             pass
 
     
+    # ---------------- Background jobs ---------------- #
+    #
+    # Work runs on a daemon thread and reports back through a queue that the
+    # Tk loop drains every POLL_MS; widgets are only touched from the main
+    # thread. Cancel sets an Event the sweeps check between data points.
+
+    POLL_MS = 100
+
+    def submit(self, title, work, on_done, total=None, on_row=None):
+        # work(report, cancel) runs on the worker thread; report(row) hands a
+        # partial result to on_row on the main thread. on_done(result,
+        # cancelled) gets the return value of work.
+        if self.busy():
+            return
+
+        messages = queue.Queue()
+        cancel = threading.Event()
+        self.job = {"title": title, "messages": messages, "cancel": cancel,
+                    "on_done": on_done, "on_row": on_row, "total": total, "count": 0}
+
+        def target():
+            try:
+                result = work(lambda row: messages.put(('row', row)), cancel)
+                messages.put(('done', result))
+            except Exception as e:
+                messages.put(('error', e))
+
+        if total:
+            self.progress.config(mode='determinate', maximum=total, value=0)
+        else:
+            self.progress.config(mode='indeterminate')
+            self.progress.start(10)
+        self.status_var.set(f"{title}...")
+        self.cancel_button.config(state='normal')
+        threading.Thread(target=target, daemon=True).start()
+        self.root.after(self.POLL_MS, self.poll_job)
+
+    def busy(self):
+        if self.job is not None:
+            messagebox.showinfo("Busy", "Another job is still running. Cancel it or wait for it to finish.")
+            return True
+        return False
+
+    def poll_job(self):
+        job = self.job
+        try:
+            while True:
+                kind, payload = job["messages"].get_nowait()
+                if kind == 'row':
+                    job["count"] += 1
+                    if job["total"]:
+                        self.progress.config(value=min(job["count"], job["total"]))
+                        self.status_var.set(f"{job['title']}: {job['count']}/{job['total']}")
+                    if job["on_row"] is not None:
+                        job["on_row"](payload)
+                else:
+                    self.finish_job(kind, payload)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(self.POLL_MS, self.poll_job)
+
+    def finish_job(self, kind, payload):
+        job, self.job = self.job, None
+        cancelled = job["cancel"].is_set()
+        self.progress.stop()
+        self.progress.config(mode='determinate', value=self.progress.cget('maximum') if kind == 'done' else 0)
+        self.cancel_button.config(state='disabled')
+        if kind == 'error':
+            self.status_var.set(f"{job['title']}: failed")
+            messagebox.showerror("Error", str(payload))
+            return
+        self.status_var.set(f"{job['title']}: {'cancelled' if cancelled else 'done'}")
+        job["on_done"](payload, cancelled)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job["cancel"].set()
+            self.status_var.set(f"{self.job['title']}: cancelling...")
+
+    def timed_mst(self, alg, nodes, edges=None):
+        # runs on the worker thread; profile_enabled is copied from the
+        # checkbox on the main thread before the job is submitted
+        info = {}
+        profiler = Profiler() if self.profile_enabled else None
+        start = time.time()
+        mst_edges, total = self.mst_cache.run(alg, nodes, edges, info=info, profiler=profiler)
+        elapsed = (time.time() - start) * 1000
+        if profiler is not None:
+            info['profile'] = profiler
+        if info['cache'] == 'hit' and 'runtime_ms' in info:
+            # a hit only costs the lookup; report the run that produced it
+            info['lookup_ms'] = elapsed
+            elapsed = info['runtime_ms']
+        return mst_edges, total, elapsed, info
+
+    def show_run_info(self, info):
+        if 'engine' in info:
+            self.result_area.insert('end', f"Engine: {info['engine']} ({info['reason']})\n")
+        stats = self.mst_cache.stats()
+        self.result_area.insert('end', f"Cache: {info['cache']} (hits={stats['hits']}, misses={stats['misses']})\n")
+        if 'lookup_ms' in info:
+            self.result_area.insert('end', f"Cached result (lookup {info['lookup_ms']:.3f} ms); runtime is from the original run\n")
+        if 'profile' in info:
+            self.result_area.insert('end', "Profile:\n")
+            for line in info['profile'].lines():
+                self.result_area.insert('end', f"  {line}\n")
+
     def run_algorithm(self):
         text = self.input_area.get('1.0', 'end').strip()
         if not text:
@@ -137,28 +302,88 @@ class MSTApp:
             return
 
         alg = self.alg_var.get().lower()
+        self.profile_enabled = self.profile_var.get()
 
+        def work(report, cancel):
+            # the layout is cached per graph, so only the first run pays for it
+            return self.timed_mst(alg, nodes, edges), node_positions(nodes, edges)
 
-        start = time.time()
-        if alg == 'kruskal':
-            mst_edges, total = kruskal_mst(nodes, edges)
-        else:
-            mst_edges, total = prim_mst(nodes, edges)
-        elapsed = (time.time() - start) * 1000
+        def done(result, cancelled):
+            if cancelled:
+                return
+            (mst_edges, total, elapsed, info), positions = result
+
+            self.result_area.config(state='normal')
+            self.result_area.delete('1.0', 'end')
+            self.result_area.insert('end', f"Algorithm: {alg.title()}\n")
+            self.show_run_info(info)
+            self.result_area.insert('end', f"Total weight: {total:g}\n")
+            self.result_area.insert('end', f"Runtime: {elapsed:.3f} ms\n\n")
+            self.result_area.insert('end', "Edges in MST:\n")
+            for u, v, w in mst_edges:
+                self.result_area.insert('end', f"{u} {v} {w:g}\n")
+            self.result_area.config(state='disabled')
+
+            draw_graph(self.ax, nodes, edges, mst_edges, positions=positions)
+            self.canvas.draw()
+
+        self.submit(f"Running {alg}", work, done)
 
+    def run_file(self):
+        path = filedialog.askopenfilename(
+            title="Load edge list",
+            filetypes=[("Edge lists", "*.txt *.edges *.el"), ("All files", "*")],
+        )
+        if not path:
+            return
 
-        self.result_area.config(state='normal')
-        self.result_area.delete('1.0', 'end')
-        self.result_area.insert('end', f"Algorithm: {alg.title()}\n")
-        self.result_area.insert('end', f"Total weight: {total:g}\n")
-        self.result_area.insert('end', f"Runtime: {elapsed:.3f} ms\n\n")
-        self.result_area.insert('end', "Edges in MST:\n")
-        for u, v, w in mst_edges:
-            self.result_area.insert('end', f"{u} {v} {w:g}\n")
-        self.result_area.config(state='disabled')
+        alg = self.alg_var.get().lower()
+        self.profile_enabled = self.profile_var.get()
+
+        def work(report, cancel):
+            graph = load_edge_file(path)
+            if cancel.is_set():
+                return graph, None, None, None
+            run = self.timed_mst(alg, graph)
+            if cancel.is_set():
+                return graph, run, None, None
+            mst_edges = run[0]
+            if graph.num_edges <= MAX_DRAWN_EDGES:
+                shown, hidden = graph.edge_tuples(), 0
+            else:
+                # sample only non-MST edges; the MST is always drawn in full
+                regular = non_mst_edge_ids(graph, mst_edges)
+                ids = np.random.default_rng(0).choice(regular, min(MAX_DRAWN_EDGES, len(regular)), replace=False)
+                shown = graph.edge_tuples(np.sort(ids)) + mst_edges
+                hidden = len(regular) - len(ids)
+            return graph, run, (shown, hidden), node_positions(graph.labels, shown)
+
+        def done(result, cancelled):
+            graph, run, drawn, positions = result
+            if cancelled or positions is None:
+                return
+            mst_edges, total, elapsed, info = run
+
+            self.result_area.config(state='normal')
+            self.result_area.delete('1.0', 'end')
+            self.result_area.insert('end', f"File: {os.path.basename(path)}\nNodes={graph.num_nodes}, Edges={graph.num_edges}\n")
+            self.result_area.insert('end', f"Algorithm: {alg.title()}\n")
+            self.show_run_info(info)
+            self.result_area.insert('end', f"Total weight: {total:g}\n")
+            self.result_area.insert('end', f"Runtime: {elapsed:.3f} ms\n\n")
+            self.result_area.insert('end', "Edges in MST:\n")
+            for u, v, w in mst_edges[:MAX_LISTED_EDGES]:
+                self.result_area.insert('end', f"{u} {v} {w:g}\n")
+            if len(mst_edges) > MAX_LISTED_EDGES:
+                self.result_area.insert('end', f"... {len(mst_edges) - MAX_LISTED_EDGES} more\n")
+            self.result_area.config(state='disabled')
+
+            shown, hidden = drawn
+            draw_graph(self.ax, graph.labels, shown, mst_edges,
+                       hidden_edges=hidden, positions=positions)
+            self.canvas.draw()
 
-        draw_graph(self.ax, nodes, edges, mst_edges)
-        self.canvas.draw()
+        self.submit(f"Loading {os.path.basename(path)}", work, done)
 
     def run_random_graph(self):
         try:
@@ -171,29 +396,67 @@ class MSTApp:
             messagebox.showerror("Error", "Invalid input.")
             return
 
-        nodes, edges = generate_random_graph(n, m)
-
+        family, weights = self.rand_family.get(), self.rand_weights.get()
         alg = self.alg_var.get().lower()
+        self.profile_enabled = self.profile_var.get()
 
-        start = time.time()
-        if alg == "kruskal":
-            mst_edges, total = kruskal_mst(nodes, edges)
-        else:
-            mst_edges, total = prim_mst(nodes, edges)
-        elapsed = (time.time() - start) * 1000
+        def work(report, cancel):
+            graph = make_graph(family, n, m, weights)
+            run = self.timed_mst(alg, graph)
+            edges = graph.edge_tuples()
+            return graph, edges, run, node_positions(graph.labels, edges)
+
+        def done(result, cancelled):
+            if cancelled:
+                return
+            graph, edges, (mst_edges, total, elapsed, info), positions = result
+
+            self.result_area.config(state='normal')
+            self.result_area.delete('1.0', 'end')
+            self.result_area.insert('end', f"Random Graph Generated ({family})\nNodes={graph.num_nodes}, Edges={graph.num_edges}\n")
+            self.result_area.insert('end', f"Algorithm: {alg.title()}\n")
+            self.show_run_info(info)
+            self.result_area.insert('end', f"Runtime: {elapsed:.3f} ms\n")
+            self.result_area.insert('end', f"Total Weight: {total:g}\n\n")
+            for u, v, w in mst_edges:
+                self.result_area.insert('end', f"{u} {v} {w:g}\n")
+            self.result_area.config(state='disabled')
+
+            draw_graph(self.ax, graph.labels, edges, mst_edges, positions=positions)
+            self.canvas.draw()
 
-        self.result_area.config(state='normal')
-        self.result_area.delete('1.0', 'end')
-        self.result_area.insert('end', f"Random Graph Generated\nNodes={n}, Edges={m}\n")
-        self.result_area.insert('end', f"Algorithm: {alg.title()}\n")
-        self.result_area.insert('end', f"Runtime: {elapsed:.3f} ms\n")
-        self.result_area.insert('end', f"Total Weight: {total:g}\n\n")
-        for u, v, w in mst_edges:
-            self.result_area.insert('end', f"{u} {v} {w:g}\n")
-        self.result_area.config(state='disabled')
+        self.submit("Random graph", work, done)
 
-        draw_graph(self.ax, nodes, edges, mst_edges)
-        self.canvas.draw()
+    def run_sweep(self, title, sweep, total, xlabel, plot_title, figsize):
+        # live plot: runtime on the left, peak/retained memory (tracemalloc)
+        # on the right, redrawn from the rows received so far on every point
+        if self.busy():
+            return
+
+        fig, (ax, mem_ax) = plt.subplots(1, 2, figsize=(figsize[0] * 2, figsize[1]))
+        rows = []
+
+        def redraw(shown, suffix=""):
+            ax.clear()
+            plot_rows(ax, shown, xlabel, plot_title + suffix)
+            mem_ax.clear()
+            plot_memory(mem_ax, shown, xlabel, "Peak / retained memory" + suffix)
+            fig.canvas.draw_idle()
+
+        def on_row(row):
+            # parallel sweeps report points out of order; sort for the
+            # progress plot so the lines don't zig-zag
+            rows.append(row)
+            redraw(sorted(rows, key=lambda r: r["x"]))
+
+        def done(result, cancelled):
+            # the sweep returns its rows merged back into serial order
+            redraw(result if result is not None else sorted(rows, key=lambda r: r["x"]),
+                   " (cancelled)" if cancelled else "")
+
+        plt.show(block=False)
+        self.submit(title, lambda report, cancel: sweep(on_point=report, cancel=cancel), done,
+                    total=total, on_row=on_row)
 
     def run_dense_sparse_experiment(self):
         try:
@@ -204,59 +467,16 @@ class MSTApp:
             messagebox.showerror("Error", "Please enter a valid max node count (e.g., 1000).")
             return
 
-        step = max(5, max_n // 50)
-        node_values = list(range(step, max_n + 1, step))
-
-        prim_sparse = []
-        kruskal_sparse = []
-        prim_dense = []
-        kruskal_dense = []
-
-        import time
-
-        for n in node_values:
-            sparse_edges = n * (n - 1) // 6
-            nodes, edges = generate_random_graph(n, sparse_edges)
-
-            t0 = time.time()
-            prim_mst(nodes, edges)
-            prim_sparse.append((time.time() - t0) * 1000)
-
-            t0 = time.time()
-            kruskal_mst(nodes, edges)
-            kruskal_sparse.append((time.time() - t0) * 1000)
-
-            dense_edges = n * (n - 1) // 2
-            nodes, edges = generate_random_graph(n, dense_edges)
-
-            t0 = time.time()
-            prim_mst(nodes, edges)
-            prim_dense.append((time.time() - t0) * 1000)
-
-            t0 = time.time()
-            kruskal_mst(nodes, edges)
-            kruskal_dense.append((time.time() - t0) * 1000)
-
-            print(f"Completed n={n}")
-
-        fig = plt.figure(figsize=(9, 6))
-        ax = fig.add_subplot(111)
-
-        ax.plot(node_values, prim_sparse, marker='o', label="Prim (Sparse)")
-        ax.plot(node_values, kruskal_sparse, marker='o', label="Kruskal (Sparse)")
-        ax.plot(node_values, prim_dense, marker='o', label="Prim (Dense)")
-        ax.plot(node_values, kruskal_dense, marker='o', label="Kruskal (Dense)")
-
-        ax.set_xlabel("Number of Nodes")
-        ax.set_ylabel("Runtime (ms)")
-        ax.set_title("Runtime Comparison: Dense vs Sparse Graphs")
-        ax.legend()
-        ax.grid(True)
-
-        plt.show()
+        total = 2 * len(dense_sparse_points(max_n)) * len(DENSE_SPARSE_ENGINES)
+        self.run_sweep(
+            "Dense/Sparse test",
+            lambda **kw: dense_sparse_sweep(max_n, repeats=1, warmup=0, workers=SWEEP_WORKERS, pin=True, **kw),
+            total, "Number of Nodes", "Runtime Comparison: Dense vs Sparse Graphs", (9, 6),
+        )
 
     def run_series_experiment(self):
         mode = self.exp_mode.get()
+        family, weights = self.series_family.get(), self.series_weights.get()
 
         if mode == "node_variable":
             try:
@@ -266,31 +486,13 @@ class MSTApp:
                 messagebox.showerror("Error", "Enter valid numbers. Example:\nNodes: 10,20,30\nEdges: 50")
                 return
 
-            prim_times = []
-            kruskal_times = []
-
-            for n in node_list:
-                m = fixed_edges
-                nodes, edges = generate_random_graph(n, m)
-
-                start = time.time()
-                prim_mst(nodes, edges)
-                prim_times.append((time.time() - start) * 1000)
-
-                start = time.time()
-                kruskal_mst(nodes, edges)
-                kruskal_times.append((time.time() - start) * 1000)
-
-            fig = plt.figure(figsize=(7,5))
-            ax = fig.add_subplot(111)
-            ax.plot(node_list, prim_times, marker='o', label="Prim's")
-            ax.plot(node_list, kruskal_times, marker='o', label="Kruskal")
-            ax.set_xlabel("Number of Nodes")
-            ax.set_ylabel("Runtime (ms)")
-            ax.set_title(f"MST Runtime vs Nodes (Edges fixed = {fixed_edges})")
-            ax.legend(); ax.grid(True)
-            plt.show()
-            return
+            self.run_sweep(
+                "Node sweep",
+                lambda **kw: node_sweep(node_list, fixed_edges, family=family, weights=weights,
+                                        repeats=1, warmup=0, workers=SWEEP_WORKERS, pin=True, **kw),
+                sweep_rows(node_list), "Number of Nodes",
+                f"MST Runtime vs Nodes (Edges fixed = {fixed_edges}, {family})", (7, 5),
+            )
         else:
             try:
                 edge_list = [int(x) for x in self.series_edges_entry.get().split(',')]
@@ -299,30 +501,10 @@ class MSTApp:
                 messagebox.showerror("Error", "Enter valid numbers. Example:\nNodes: 50\nEdges: 50,100,200")
                 return
 
-            prim_times = []
-            kruskal_times = []
-
-            for m in edge_list:
-                n = fixed_nodes
-                nodes, edges = generate_random_graph(n, m)
-
-                start = time.time()
-                prim_mst(nodes, edges)
-                prim_times.append((time.time() - start) * 1000)
-
-                start = time.time()
-                kruskal_mst(nodes, edges)
-                kruskal_times.append((time.time() - start) * 1000)
-
-            fig = plt.figure(figsize=(7,5))
-            ax = fig.add_subplot(111)
-            ax.plot(edge_list, prim_times, marker='o', label="Prim's")
-            ax.plot(edge_list, kruskal_times, marker='o', label="Kruskal")
-            ax.set_xlabel("Number of Edges")
-            ax.set_ylabel("Runtime (ms)")
-            ax.set_title(f"MST Runtime vs Edges (Nodes fixed = {fixed_nodes})")
-            ax.legend(); ax.grid(True)
-            plt.show()
-
-
-
+            self.run_sweep(
+                "Edge sweep",
+                lambda **kw: edge_sweep(fixed_nodes, edge_list, family=family, weights=weights,
+                                        repeats=1, warmup=0, workers=SWEEP_WORKERS, pin=True, **kw),
+                sweep_rows([fixed_nodes] * len(edge_list)), "Number of Edges",
+                f"MST Runtime vs Edges (Nodes fixed = {fixed_nodes}, {family})", (7, 5),
+            )
@@ -0,0 +1,90 @@
+class IndexedHeap:
+    # d-ary min-heap over the keys 0..n-1 with decrease-key. pos[key] is the
+    # slot of key in the heap, or -1 when key is not in it, so the heap never
+    # holds more than one entry per key.
+    def __init__(self, n, d=4):
+        self.d = d
+        self.keys = []
+        self.prio = [0] * n
+        self.pos = [-1] * n
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self.pos[key] >= 0
+
+    def push(self, key, priority):
+        self.pushes += 1
+        self.prio[key] = priority
+        self.pos[key] = len(self.keys)
+        self.keys.append(key)
+        self._sift_up(len(self.keys) - 1)
+
+    def decrease(self, key, priority):
+        self.decreases += 1
+        self.prio[key] = priority
+        self._sift_up(self.pos[key])
+
+    def push_or_decrease(self, key, priority):
+        # returns True if key was inserted or its priority lowered
+        if self.pos[key] < 0:
+            self.push(key, priority)
+            return True
+        if priority < self.prio[key]:
+            self.decrease(key, priority)
+            return True
+        return False
+
+    def pop(self):
+        self.pops += 1
+        keys, pos = self.keys, self.pos
+        top = keys[0]
+        last = keys.pop()
+        pos[top] = -1
+        if keys:
+            keys[0] = last
+            pos[last] = 0
+            self._sift_down(0)
+        return top, self.prio[top]
+
+    def _sift_up(self, i):
+        keys, pos, prio, d = self.keys, self.pos, self.prio, self.d
+        key = keys[i]
+        p = prio[key]
+        while i > 0:
+            parent = (i - 1) // d
+            up = keys[parent]
+            if prio[up] <= p:
+                break
+            keys[i] = up
+            pos[up] = i
+            i = parent
+        keys[i] = key
+        pos[key] = i
+
+    def _sift_down(self, i):
+        keys, pos, prio, d = self.keys, self.pos, self.prio, self.d
+        n = len(keys)
+        key = keys[i]
+        p = prio[key]
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            best = first
+            best_p = prio[keys[first]]
+            for c in range(first + 1, min(first + d, n)):
+                cp = prio[keys[c]]
+                if cp < best_p:
+                    best, best_p = c, cp
+            if best_p >= p:
+                break
+            keys[i] = keys[best]
+            pos[keys[i]] = i
+            i = best
+        keys[i] = key
+        pos[key] = i
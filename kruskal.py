@@ -1,16 +1,112 @@
 from typing import List, Tuple, Any
+
+import numpy as np
+
 from dsu import *
+from graph import as_graph
+from profiling import get_profiler
+
+
+def kruskal_indices(src, dst, weight, num_nodes, stable=True, order=None, profiler=None):
+    # Kruskal over parallel endpoint/weight arrays. Returns the ids of the
+    # accepted edges (positions in the input arrays) in acceptance order.
+    prof = get_profiler(profiler)
+    with prof.phase("sort"):
+        if order is None:
+            order = np.argsort(weight, kind='stable' if stable else 'quicksort')
+        order = np.asarray(order)
+
+    dsu = ArrayDisjointSetUnion(num_nodes) if profiler is None else CountingDisjointSetUnion(num_nodes)
+    union = dsu.union
+    target = num_nodes - 1
+    chosen = []
+
+    with prof.phase("union-find"):
+        for i, u, v in zip(order.tolist(), src[order].tolist(), dst[order].tolist()):
+            if union(u, v):
+                chosen.append(i)
+                if len(chosen) == target:
+                    break
+
+    if profiler is not None:
+        dsu.report(profiler)
+    return np.asarray(chosen, dtype=np.int64)
+
+
+def filter_kruskal_indices(src, dst, weight, num_nodes, threshold=4096, profiler=None):
+    # Filter-Kruskal: split the edges around a pivot weight, solve the light
+    # part first, then drop heavy edges whose endpoints are already joined
+    # before they are ever sorted. Small parts fall back to plain Kruskal.
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    weight = np.asarray(weight)
+
+    prof = get_profiler(profiler)
+    dsu = ArrayDisjointSetUnion(num_nodes) if profiler is None else CountingDisjointSetUnion(num_nodes)
+    union = dsu.union
+    target = num_nodes - 1
+    chosen = []
+
+    def solve(ids):
+        with prof.phase("sort"):
+            order = ids[np.argsort(weight[ids], kind='stable')]
+        with prof.phase("union-find"):
+            for i, u, v in zip(order.tolist(), src[order].tolist(), dst[order].tolist()):
+                if union(u, v):
+                    chosen.append(i)
+                    if len(chosen) == target:
+                        return
+
+    def visit(ids):
+        if len(chosen) >= target or not len(ids):
+            return
+        w = weight[ids]
+        if len(ids) <= threshold:
+            return solve(ids)
+
+        with prof.phase("partition"):
+            sample = w[::max(1, len(w) // 1024)]
+            pivot = np.median(sample)
+            light = w <= pivot
+            if light.all():
+                light = w < pivot
+        if not light.any():
+            return solve(ids)
+
+        visit(ids[light])
+        heavy = ids[~light]
+        if len(chosen) >= target or not len(heavy):
+            return
+        with prof.phase("filter"):
+            keep = dsu.find_many(src[heavy]) != dsu.find_many(dst[heavy])
+        prof.count("filtered_edges", int(len(heavy) - keep.sum()))
+        visit(heavy[keep])
+
+    visit(np.arange(len(src)))
+    if profiler is not None:
+        dsu.report(profiler)
+    return np.asarray(chosen, dtype=np.int64)
+
+
+def kruskal_mst(nodes, edges=None, profiler=None):
+    prof = get_profiler(profiler)
+    with prof.phase("build"):
+        graph = as_graph(nodes, edges)
+    with prof.phase("sort"):
+        order = graph.sorted_order()
+    ids = kruskal_indices(graph.src, graph.dst, graph.weight, graph.num_nodes,
+                          order=order, profiler=profiler)
 
+    cost = sum(graph.weight[ids].tolist())
+    return graph.edge_tuples(ids), cost
 
-def kruskal_mst(nodes, edges):
-    dsu = DisjointSetUnion(nodes)
 
-    cost = 0
-    mst_edges = []
-    
-    for u, v, w in sorted(edges, key=lambda e: e[2]):
-        if dsu.union(u, v):
-            mst_edges.append((u, v, w))
-            cost += w
+def filter_kruskal_mst(nodes, edges=None, profiler=None):
+    prof = get_profiler(profiler)
+    with prof.phase("build"):
+        graph = as_graph(nodes, edges)
+    ids = filter_kruskal_indices(graph.src, graph.dst, graph.weight, graph.num_nodes,
+                                 profiler=profiler)
 
-    return mst_edges, cost
+    cost = sum(graph.weight[ids].tolist())
+    return graph.edge_tuples(ids), cost
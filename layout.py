@@ -0,0 +1,201 @@
+import hashlib
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from grid import cell_pairs
+
+
+# Fruchterman-Reingold force-directed layout, vectorized with NumPy.
+# Repulsion uses a two-level grid instead of all O(V^2) pairs:
+#   - exact between nodes in the same or neighbouring fine cells,
+#   - fine-cell centres of mass for the rest of the neighbouring coarse cells,
+#   - coarse-cell centres of mass for everything further away.
+# Each coarse cell is BLOCK x BLOCK fine cells.
+
+BLOCK = 4
+
+# Above ITERATION_BUDGET_NODES nodes the default iteration count shrinks in
+# proportion, so a 10k-node layout costs about what a 5k one does (2-3 s);
+# MIN_ITERATIONS still gives a readable picture.
+FULL_ITERATIONS = 60
+ITERATION_BUDGET_NODES = 5000
+MIN_ITERATIONS = 15
+
+
+def _centres(cell_id, pos, size):
+    counts = np.bincount(cell_id, minlength=size)
+    centre = np.zeros((size, 2))
+    for axis in (0, 1):
+        centre[:, axis] = np.bincount(cell_id, pos[:, axis], minlength=size)
+    filled = counts > 0
+    centre[filled] /= counts[filled, None]
+    return centre, counts
+
+
+def _cell_forces(centre, counts, sources, targets, k2, size):
+    # repulsion on each target cell from each source cell's total mass;
+    # pairs are given as flat index arrays
+    delta = centre[targets] - centre[sources]
+    dist2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-12)
+    push = delta * (counts[sources] * k2 / dist2)[:, None]
+    force = np.zeros((size, 2))
+    for axis in (0, 1):
+        force[:, axis] = np.bincount(targets, push[:, axis], minlength=size)
+    return force
+
+
+def _approx_pairs(coarse_side):
+    # (source, target) flat ids of every pair of grid cells that, at both
+    # levels, the repulsion approximates by centres of mass. The quantile
+    # grid keeps its shape for a whole layout, so this is built once.
+    fine_side = coarse_side * BLOCK
+    fx, fy = np.divmod(np.arange(fine_side ** 2), fine_side)
+    offsets = np.arange(-BLOCK, 2 * BLOCK)
+    gx = (fx // BLOCK * BLOCK)[:, None, None] + offsets[None, :, None]
+    gy = (fy // BLOCK * BLOCK)[:, None, None] + offsets[None, None, :]
+    shape = (len(fx), len(offsets), len(offsets))
+    gx, gy = np.broadcast_to(gx, shape), np.broadcast_to(gy, shape)
+    inside = (gx >= 0) & (gx < fine_side) & (gy >= 0) & (gy < fine_side)
+    # fine cells of the neighbouring coarse cells that aren't fine neighbours
+    apart = (np.abs(gx - fx[:, None, None]) > 1) | (np.abs(gy - fy[:, None, None]) > 1)
+    keep = inside & apart
+    middle = ((gx * fine_side + gy)[keep],
+              np.broadcast_to(np.arange(len(fx))[:, None, None], shape)[keep])
+
+    # coarse cells that aren't coarse neighbours
+    cx, cy = np.divmod(np.arange(coarse_side ** 2), coarse_side)
+    far = (np.abs(cx[:, None] - cx[None, :]) > 1) | (np.abs(cy[:, None] - cy[None, :]) > 1)
+    t, s = np.nonzero(far)
+    return middle, (s, t)
+
+
+def _occupied(pairs, counts):
+    sources, targets = pairs
+    keep = (counts[sources] > 0) & (counts[targets] > 0)
+    return sources[keep], targets[keep]
+
+
+def _repulsion(pos, k, coarse_side, approx_pairs):
+    n = len(pos)
+    fine_side = coarse_side * BLOCK
+    k2 = k * k
+    disp = np.zeros((n, 2))
+
+    # cell boundaries at quantiles of each axis, so the crowded middle of a
+    # hairball gets small cells instead of a few overfull ones
+    cuts = np.linspace(0, 1, fine_side + 1)[1:-1]
+    cell = np.empty((n, 2), dtype=np.int64)
+    for axis in (0, 1):
+        cell[:, axis] = np.searchsorted(np.quantile(pos[:, axis], cuts), pos[:, axis], side='right')
+
+    # exact near field
+    a, b, fine_id, _ = cell_pairs(cell, fine_side)
+    delta = pos[a] - pos[b]
+    dist2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-12)
+    push = delta * (k2 / dist2)[:, None]
+    for axis in (0, 1):
+        disp[:, axis] += np.bincount(a, push[:, axis], minlength=n)
+        disp[:, axis] -= np.bincount(b, push[:, axis], minlength=n)
+
+    middle, far = approx_pairs
+    # middle field: fine-cell centres of mass within the coarse neighbourhood
+    fine_centre, fine_counts = _centres(fine_id, pos, fine_side ** 2)
+    sources, targets = _occupied(middle, fine_counts)
+    disp += _cell_forces(fine_centre, fine_counts, sources, targets, k2, fine_side ** 2)[fine_id]
+
+    # far field: coarse-cell centres of mass
+    coarse = cell // BLOCK
+    coarse_id = coarse[:, 0] * coarse_side + coarse[:, 1]
+    coarse_centre, coarse_counts = _centres(coarse_id, pos, coarse_side ** 2)
+    sources, targets = _occupied(far, coarse_counts)
+    disp += _cell_forces(coarse_centre, coarse_counts, sources, targets, k2, coarse_side ** 2)[coarse_id]
+    return disp
+
+
+def default_iterations(num_nodes):
+    scaled = FULL_ITERATIONS * ITERATION_BUDGET_NODES // max(1, num_nodes)
+    return max(MIN_ITERATIONS, min(FULL_ITERATIONS, scaled))
+
+
+def force_layout(nodes, edges, iterations=None, seed=0, mst_edges=None):
+    # Returns {node: (x, y)} scaled into [-1, 1]. With mst_edges, only the
+    # tree pulls nodes together, which untangles large graphs much faster
+    # and reads like a drawing of the MST.
+    nodes = list(nodes)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: (0.0, 0.0)}
+
+    if iterations is None:
+        iterations = default_iterations(n)
+    index = {x: i for i, x in enumerate(nodes)}
+    springs = mst_edges if mst_edges is not None else edges
+    src = np.fromiter((index[u] for u, _, _ in springs), dtype=np.int64, count=len(springs))
+    dst = np.fromiter((index[v] for _, v, _ in springs), dtype=np.int64, count=len(springs))
+
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    k = math.sqrt(1.0 / n)
+    # about two nodes per fine cell, at most 32 x 32 coarse cells
+    coarse_side = max(1, min(32, math.ceil(math.sqrt(n / 2) / BLOCK)))
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+
+    approx_pairs = _approx_pairs(coarse_side)
+    for _ in range(iterations):
+        disp = _repulsion(pos, k, coarse_side, approx_pairs)
+
+        # attraction d^2 / k along every spring
+        delta = pos[src] - pos[dst]
+        dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        pull = delta * (dist / k)[:, None]
+        for axis in (0, 1):
+            disp[:, axis] -= np.bincount(src, pull[:, axis], minlength=n)
+            disp[:, axis] += np.bincount(dst, pull[:, axis], minlength=n)
+
+        length = np.maximum(np.sqrt(np.einsum('ij,ij->i', disp, disp)), 1e-12)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    pos -= pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    if scale > 0:
+        pos /= scale
+    return {node: (x, y) for node, (x, y) in zip(nodes, pos.tolist())}
+
+
+# ---------------- position cache ---------------- #
+
+_CACHE_SIZE = 8
+_cache = OrderedDict()
+
+
+def graph_fingerprint(nodes, edges):
+    # positions depend on the node set and the endpoints only, so a new MST
+    # (or a reweighted edge) on the same input reuses the cached layout
+    digest = hashlib.sha1()
+    for node in nodes:
+        digest.update(repr(node).encode())
+        digest.update(b"\0")
+    digest.update(b"\1")
+    for u, v, _ in edges:
+        digest.update(repr((u, v)).encode())
+    return digest.hexdigest()
+
+
+def cached_force_layout(nodes, edges, mst_edges=None, **options):
+    key = (graph_fingerprint(nodes, edges),
+           None if mst_edges is None else graph_fingerprint((), mst_edges),
+           tuple(sorted(options.items())))
+    positions = _cache.get(key)
+    if positions is None:
+        positions = _cache[key] = force_layout(nodes, edges, mst_edges=mst_edges, **options)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return positions
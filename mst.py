@@ -0,0 +1,170 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from graph import Graph, as_graph
+from kruskal import kruskal_mst, filter_kruskal_mst
+from prims import prim_mst, prim_mst_eager, prim_mst_dense
+from boruvka import boruvka_mst
+
+
+ENGINES = {
+    "kruskal": kruskal_mst,
+    "prim": prim_mst,
+    "prim_eager": prim_mst_eager,
+    "prim_dense": prim_mst_dense,
+    "boruvka": boruvka_mst,
+    "filter_kruskal": filter_kruskal_mst,
+}
+
+
+# ---------------- auto dispatch ---------------- #
+
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mst_calibration.json")
+
+DEFAULT_THRESHOLDS = {
+    # density (E / (V(V-1)/2)) from which the O(V^2) matrix Prim wins
+    "dense_density": 0.3,
+    # largest V for which a V x V float64 matrix is acceptable
+    "dense_max_nodes": 5000,
+    # E from which Filter-Kruskal beats plain Kruskal on connected input
+    "filter_min_edges": 100000,
+    "filter_min_density": 0.01,
+    # E from which Borůvka beats plain Kruskal on sparse input
+    "boruvka_min_edges": 50000,
+}
+
+
+def load_thresholds(path=CALIBRATION_FILE):
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if path and os.path.exists(path):
+        with open(path) as f:
+            thresholds.update(json.load(f))
+    return thresholds
+
+
+def save_thresholds(thresholds, path=CALIBRATION_FILE):
+    with open(path, "w") as f:
+        json.dump(thresholds, f, indent=2, sort_keys=True)
+
+
+def choose_engine(graph, thresholds=None, connected=None):
+    # returns (engine name, human-readable reason)
+    if thresholds is None:
+        thresholds = load_thresholds()
+    n, m = graph.num_nodes, graph.num_edges
+    density = 2 * m / (n * (n - 1)) if n > 1 else 0.0
+    facts = f"V={n}, E={m}, density={density:.3g}, weights={graph.weight.dtype}"
+
+    if m == 0 or n < 2:
+        return "kruskal", f"{facts}: trivial graph"
+
+    # the matrix engine works in float64; huge integer weights would round
+    exact_floats = graph.weight.dtype.kind == 'f' or np.abs(graph.weight).max() < 2 ** 53
+    if density >= thresholds["dense_density"] and n <= thresholds["dense_max_nodes"] and exact_floats:
+        return "prim_dense", (f"{facts}: density >= {thresholds['dense_density']:g} "
+                              f"and V <= {thresholds['dense_max_nodes']}")
+
+    # Filter-Kruskal pays off by stopping early, which needs a spanning tree
+    if (connected is not False and m >= thresholds["filter_min_edges"]
+            and density >= thresholds["filter_min_density"]):
+        return "filter_kruskal", (f"{facts}: E >= {thresholds['filter_min_edges']} "
+                                  f"and density >= {thresholds['filter_min_density']:g}")
+
+    if m >= thresholds["boruvka_min_edges"]:
+        return "boruvka", f"{facts}: sparse with E >= {thresholds['boruvka_min_edges']}"
+
+    return "kruskal", f"{facts}: below every large-graph threshold"
+
+
+def auto_mst(nodes, edges=None, info=None, thresholds=None, connected=None, profiler=None):
+    graph = as_graph(nodes, edges)
+    name, reason = choose_engine(graph, thresholds, connected)
+    if info is not None:
+        info["engine"] = name
+        info["reason"] = reason
+    return ENGINES[name](graph, profiler=profiler)
+
+
+ENGINES["auto"] = auto_mst
+
+
+def run_mst(algorithm, nodes, edges=None, info=None, profiler=None):
+    # info, if given, receives the engine choice when algorithm is "auto";
+    # profiler (a profiling.Profiler) receives per-phase timings and counters
+    try:
+        engine = ENGINES[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown MST algorithm {algorithm!r}; expected one of {', '.join(ENGINES)}")
+    if engine is auto_mst:
+        return auto_mst(nodes, edges, info=info, profiler=profiler)
+    return engine(nodes, edges, profiler=profiler)
+
+
+# ---------------- calibration ---------------- #
+
+def _random_graph(n, m, rng):
+    src = rng.integers(0, n, m, dtype=np.int32)
+    dst = (src + rng.integers(1, n, m, dtype=np.int32)) % n
+    return Graph(range(n), src, dst, rng.random(m))
+
+
+def _best_time(engine, graph, repeats):
+    # every run gets a fresh graph so each engine pays for its own CSR/sort,
+    # as it will on the graphs choose_engine sees
+    best = float("inf")
+    for _ in range(repeats):
+        run_graph = graph.uncached()
+        start = time.perf_counter()
+        engine(run_graph)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _crossover(points, fast, slow, repeats):
+    # first point at which `fast` beats `slow`; None if it never does
+    for value, graph in points:
+        if _best_time(ENGINES[fast], graph, repeats) < _best_time(ENGINES[slow], graph, repeats):
+            return value
+    return None
+
+
+def calibrate(nodes=1500, repeats=3, seed=0):
+    # Times the engines on this machine and returns thresholds for
+    # choose_engine. Crossovers that never happen leave the default in place.
+    rng = np.random.default_rng(seed)
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    pairs = nodes * (nodes - 1) // 2
+
+    dense_points = [(d, _random_graph(nodes, int(d * pairs), rng)) for d in (0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0)]
+    found = _crossover(dense_points, "prim_dense", "filter_kruskal", repeats)
+    if found is not None:
+        thresholds["dense_density"] = found
+
+    sparse_points = [(m, _random_graph(max(2, m // 3), m, rng)) for m in (10 ** 3, 10 ** 4, 5 * 10 ** 4, 2 * 10 ** 5, 10 ** 6)]
+    found = _crossover(sparse_points, "boruvka", "kruskal", repeats)
+    if found is not None:
+        thresholds["boruvka_min_edges"] = found
+
+    found = _crossover(dense_points, "filter_kruskal", "kruskal", repeats)
+    if found is not None:
+        thresholds["filter_min_density"] = found
+
+    filter_points = []
+    for n in (100, 300, 1000, 3000):
+        m = int(0.05 * n * (n - 1) / 2)
+        filter_points.append((m, _random_graph(n, m, rng)))
+    found = _crossover(filter_points, "filter_kruskal", "kruskal", repeats)
+    if found is not None:
+        thresholds["filter_min_edges"] = found
+
+    return thresholds
+
+
+if __name__ == "__main__":
+    thresholds = calibrate()
+    save_thresholds(thresholds)
+    print(json.dumps(thresholds, indent=2, sort_keys=True))
+    print(f"Saved to {CALIBRATION_FILE}")
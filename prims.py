@@ -1,44 +1,172 @@
 import heapq
-from collections import defaultdict
 from typing import List
 
+import numpy as np
 
-def prim_mst(nodes, edges):
-    adj = defaultdict(list)
+from graph import as_graph
+from indexed_heap import IndexedHeap
+from profiling import get_profiler
 
-    for u, v, w in edges:
-        adj[u].append((v, w))
-        adj[v].append((u, w))
 
-    remaining = set(nodes)
+def prim_mst(nodes, edges=None, profiler=None):
+    prof = get_profiler(profiler)
+    with prof.phase("build"):
+        graph = as_graph(nodes, edges)
+    labels = graph.labels
+    with prof.phase("adjacency"):
+        offsets, neighbors, weights, _ = graph.csr()
+        offsets = offsets.tolist()
+        neighbors = neighbors.tolist()
+        weights = weights.tolist()
+
+    visited = bytearray(graph.num_nodes)
+    minimum_edges = []
+    total = 0
+    # the only counter in the loop; every heap is drained to empty, so
+    # pushes == pops == accepted + stale and needs no counting of its own
+    stale = 0
+
+    with prof.phase("heap"):
+        for start in range(graph.num_nodes):
+            if visited[start]:
+                continue
+
+            visited[start] = 1
+            pq = []
+
+            for k in range(offsets[start], offsets[start + 1]):
+                heapq.heappush(pq, (weights[k], start, neighbors[k]))
+
+            while pq:
+                w, a, b = heapq.heappop(pq)
+
+                if visited[b]:
+                    stale += 1
+                    continue
+
+                visited[b] = 1
+
+                minimum_edges.append((labels[a], labels[b], w))
+                total = total + w
+
+                for k in range(offsets[b], offsets[b + 1]):
+                    nb = neighbors[k]
+                    if not visited[nb]:
+                        heapq.heappush(pq, (weights[k], b, nb))
+
+    if profiler is not None:
+        pops = len(minimum_edges) + stale
+        profiler.count("heap_pushes", pops)
+        profiler.count("heap_pops", pops)
+        profiler.count("stale_pops", stale)
+    return minimum_edges, total
+
+
+def prim_mst_eager(nodes, edges=None, stats=None, d=4, profiler=None):
+    # Eager Prim: one heap entry per fringe vertex, keyed by the cheapest
+    # known edge into the tree and lowered in place with decrease-key.
+    prof = get_profiler(profiler)
+    with prof.phase("build"):
+        graph = as_graph(nodes, edges)
+    labels = graph.labels
+    n = graph.num_nodes
+    with prof.phase("adjacency"):
+        offsets, neighbors, weights, _ = graph.csr()
+        offsets = offsets.tolist()
+        neighbors = neighbors.tolist()
+        weights = weights.tolist()
+
+    visited = bytearray(n)
+    via = [-1] * n
+    heap = IndexedHeap(n, d)
     minimum_edges = []
     total = 0
 
-    while remaining:
-        start = next(iter(remaining))
-        
-        visited = set([start])
-        remaining.remove(start)
-        pq = []
-        
-        for v, w in adj[start]:
-            heapq.heappush(pq, (w, start, v))
-        
-        while pq:
-            w, a, b = heapq.heappop(pq)
-
-            if b in visited:
+    with prof.phase("heap"):
+        for start in range(n):
+            if visited[start]:
                 continue
-            
-            visited.add(b)
-            if b in remaining:
-                remaining.remove(b)
-            
-            minimum_edges.append((a, b, w))
-            total = total + w
-            
-            for nb, nw in adj[b]:
-                if nb not in visited:
-                    heapq.heappush(pq, (nw, b, nb))
+
+            heap.push(start, 0)
+
+            while heap:
+                b, w = heap.pop()
+                visited[b] = 1
+
+                if b != start:
+                    minimum_edges.append((labels[via[b]], labels[b], w))
+                    total = total + w
+
+                for k in range(offsets[b], offsets[b + 1]):
+                    nb = neighbors[k]
+                    if not visited[nb] and heap.push_or_decrease(nb, weights[k]):
+                        via[nb] = b
+
+    if stats is not None:
+        stats['heap_pushes'] = heap.pushes
+        stats['heap_pops'] = heap.pops
+        stats['heap_decreases'] = heap.decreases
+    if profiler is not None:
+        profiler.count("heap_pushes", heap.pushes)
+        profiler.count("heap_pops", heap.pops)
+        profiler.count("heap_decreases", heap.decreases)
+        # decrease-key never leaves stale entries behind
+        profiler.count("stale_pops", 0)
+    return minimum_edges, total
+
+
+def adjacency_matrix(graph):
+    # n x n weight matrix with +inf for missing edges; parallel edges keep
+    # the lightest weight and self-loops are dropped
+    n = graph.num_nodes
+    matrix = np.full((n, n), np.inf)
+    keep = graph.src != graph.dst
+    src, dst, weight = graph.src[keep], graph.dst[keep], graph.weight[keep]
+    np.minimum.at(matrix, (src, dst), weight)
+    np.minimum.at(matrix, (dst, src), weight)
+    return matrix
+
+
+def prim_mst_dense(nodes, edges=None, profiler=None):
+    # O(V^2) Prim for (near-)complete graphs: each step is one argmin over
+    # the min_dist vector and one vectorized relaxation against a matrix row.
+    # edges may be an n x n weight matrix (inf = no edge) or an edge list.
+    prof = get_profiler(profiler)
+    if isinstance(edges, np.ndarray) and edges.ndim == 2:
+        labels = list(nodes)
+        matrix = edges
+    else:
+        with prof.phase("build"):
+            graph = as_graph(nodes, edges)
+        labels = graph.labels
+        with prof.phase("adjacency"):
+            matrix = adjacency_matrix(graph)
+
+    n = len(labels)
+    in_tree = np.zeros(n, dtype=bool)
+    min_dist = np.full(n, np.inf)
+    via = np.full(n, -1)
+    minimum_edges = []
+    total = 0
+
+    with prof.phase("scan"):
+        for _ in range(n):
+            b = int(np.argmin(min_dist))
+            w = min_dist[b]
+            if w == np.inf:
+                # nothing reachable from the current tree: start a new one
+                b = int(np.argmin(in_tree))
+            else:
+                w = w.item()
+                minimum_edges.append((labels[via[b]], labels[b], w))
+                total = total + w
+
+            in_tree[b] = True
+            min_dist[b] = np.inf
+
+            row = matrix[b]
+            closer = (row < min_dist) & ~in_tree
+            min_dist[closer] = row[closer]
+            via[closer] = b
 
     return minimum_edges, total
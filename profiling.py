@@ -0,0 +1,53 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler:
+    # Opt-in per-phase timings and operation counters for the MST engines.
+    # Engines take profiler=None and only pay for phase boundaries when one
+    # is given; hot loops count into locals or a counting DSU instead.
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self):
+        return {"phases": dict(self.phases), "counters": dict(self.counters)}
+
+    def lines(self):
+        total = sum(self.phases.values())
+        out = []
+        for name, seconds in self.phases.items():
+            share = seconds / total * 100 if total else 0.0
+            out.append(f"{name}: {seconds * 1000:.3f} ms ({share:.0f}%)")
+        for name, n in self.counters.items():
+            out.append(f"{name}: {n}")
+        return out
+
+
+class _NoProfiler:
+    _context = nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def count(self, name, n=1):
+        pass
+
+
+NO_PROFILER = _NoProfiler()
+
+
+def get_profiler(profiler):
+    # lets engines write `prof.phase(...)` without checking for None
+    return NO_PROFILER if profiler is None else profiler
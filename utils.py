@@ -1,6 +1,16 @@
+import hashlib
 import math
-from collections import defaultdict
-import random
+import mmap
+import os
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.collections import LineCollection
+
+from graph import Graph, save_graph, load_graph, read_graph_meta
+from layout import cached_force_layout
 
 SAMPLE_GRAPH = """## Sample graph (Edges: nodeA nodeB weight)
 A B 4
@@ -19,41 +29,169 @@ F E 10
 G F 2
 """
 
-def generate_random_graph(num_nodes, num_edges):
-    nodes = [str(i) for i in range(num_nodes)]
-    edges = []
-    seen = set()
-
-    while len(edges) < num_edges:
-        u = random.choice(nodes)
-        v = random.choice(nodes)
-        if u == v:
-            continue
-        w = random.randint(1, 20)
-        key = tuple(sorted((u, v)))
-        if key not in seen:
-            seen.add(key)
-            edges.append((u, v, w))
-    return nodes, edges
+def sample_pairs(num_nodes, num_edges, seed=None):
+    # num_edges distinct unordered pairs {u, v}, u != v, drawn uniformly by
+    # sampling linear indices into the upper triangle of the adjacency matrix
+    rng = np.random.default_rng(seed)
+    n = int(num_nodes)
+    total = n * (n - 1) // 2
+    if num_edges > total:
+        raise ValueError(f"{num_edges} edges requested but {num_nodes} nodes allow at most {total}")
+
+    k = rng.choice(total, size=num_edges, replace=False).astype(np.int64)
+
+    # row i of the triangle starts at i*(2n-i-1)/2; invert that, then fix any
+    # off-by-one from float rounding
+    i = (n - 2 - np.floor(np.sqrt(-8.0 * k + 4.0 * n * (n - 1) - 7) / 2.0 - 0.5)).astype(np.int64)
+    row_start = i * (2 * n - i - 1) // 2
+    low = k < row_start
+    i[low] -= 1
+    row_start = i * (2 * n - i - 1) // 2
+    high = k >= row_start + (n - 1 - i)
+    i[high] += 1
+    row_start = i * (2 * n - i - 1) // 2
+    j = k - row_start + i + 1
+    return i.astype(np.int32), j.astype(np.int32)
+
+
+def random_graph(num_nodes, num_edges, seed=None, low=1, high=20):
+    # Graph with distinct random edges and integer weights in low..high.
+    # seed may be an int or a np.random.Generator for reproducible sweeps.
+    rng = np.random.default_rng(seed)
+    src, dst = sample_pairs(num_nodes, num_edges, rng)
+    weight = rng.integers(low, high + 1, size=num_edges)
+    return Graph([str(i) for i in range(num_nodes)], src, dst, weight)
+
+
+def generate_random_graph(num_nodes, num_edges, seed=None):
+    graph = random_graph(num_nodes, num_edges, seed)
+    return graph.labels, graph.edge_tuples()
 
 def parse_edge_list(text):            # plot
-    edges = []
+    # same line rules and errors as the file reader: both go through
+    # parse_edge_line, with labels kept as they are
     nodes = set()
+
+    def intern(label):
+        nodes.add(label)
+        return label
+
+    src, dst, weights = [], [], []
     for i, line in enumerate(text.splitlines(), start=1):
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        parts = line.split()
-        if len(parts) < 3:
-            raise ValueError(f"Line {i}: expected 'nodeA nodeB weight', got: {line!r}")
-        u, v, w = parts[0], parts[1], " ".join(parts[2:])
+        parse_edge_line(i, line, intern, src, dst, weights)
+    return list(nodes), list(zip(src, dst, weights))
+
+
+def _iter_chunks(f, chunk_size, use_mmap):
+    if use_mmap:
         try:
-            weight = float(w)
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         except ValueError:
-            raise ValueError(f"Line {i}: weight must be numeric, got {w!r}")
-        edges.append((u, v, weight))
-        nodes.add(u); nodes.add(v)
-    return list(nodes), edges
+            # empty files can't be mapped
+            return
+        try:
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+        finally:
+            data.close()
+    else:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_edge_lines(path, chunk_size=1 << 20, use_mmap=False):
+    # (line number, text) for every line, read in fixed-size chunks
+    i = 0
+    tail = b""
+    with open(path, 'rb') as f:
+        for chunk in _iter_chunks(f, chunk_size, use_mmap):
+            chunk = tail + chunk
+            cut = chunk.rfind(b"\n") + 1
+            tail = chunk[cut:]
+            lines = chunk[:cut].decode('utf-8').split("\n")
+            lines.pop()
+            for line in lines:
+                i += 1
+                yield i, line
+    if tail:
+        yield i + 1, tail.decode('utf-8')
+
+
+def read_edge_file(path, chunk_size=1 << 20, use_mmap=False):
+    # Streaming counterpart of parse_edge_list: same comment and error rules,
+    # but reads the file in fixed-size chunks straight into typed arrays, so
+    # memory tracks the size of the graph rather than the size of the text.
+    index = {}
+    labels = []
+    src = array('i')
+    dst = array('i')
+    weights = array('d')
+
+    def intern(label):
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(labels)
+            labels.append(label)
+        return i
+
+    for i, line in iter_edge_lines(path, chunk_size, use_mmap):
+        parse_edge_line(i, line, intern, src, dst, weights)
+
+    graph = Graph(labels, np.frombuffer(src, dtype=np.int32), np.frombuffer(dst, dtype=np.int32),
+                  np.frombuffer(weights, dtype=np.float64))
+    graph._index = index
+    return graph
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_edge_file(path, cache_dir=None, **read_options):
+    # read_edge_file with a binary cache next to the source (or in cache_dir).
+    # The cache is reused while the source's sha256 matches the one recorded
+    # when it was saved, and rebuilt otherwise.
+    if cache_dir is None:
+        cache_path = path + ".mstg"
+    else:
+        cache_path = os.path.join(cache_dir, os.path.basename(path) + ".mstg")
+
+    digest = file_digest(path)
+    meta = read_graph_meta(cache_path)
+    if meta is not None and meta.get("source_hash") == digest:
+        return load_graph(cache_path)
+
+    graph = read_edge_file(path, **read_options)
+    try:
+        save_graph(graph, cache_path, source_hash=digest)
+    except OSError:
+        # read-only location: still hand back the parsed graph
+        pass
+    return graph
+
+
+def parse_edge_line(i, line, intern, src, dst, weights):
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return
+    parts = line.split()
+    if len(parts) < 3:
+        raise ValueError(f"Line {i}: expected 'nodeA nodeB weight', got: {line!r}")
+    u, v, w = parts[0], parts[1], " ".join(parts[2:])
+    try:
+        weight = float(w)
+    except ValueError:
+        raise ValueError(f"Line {i}: weight must be numeric, got {w!r}")
+    src.append(intern(u))
+    dst.append(intern(v))
+    weights.append(weight)
 
 
 def layout_nodes_circle(nodes, radius=1.0):
@@ -67,58 +205,164 @@ def layout_nodes_circle(nodes, radius=1.0):
     return positions
 
 
-def draw_graph2(ax, nodes, edges, mst_edges):
+# "force" lays out the whole graph, "mst" pulls only along the tree edges
+# (faster on big graphs), "circle" is the old ring. Force layouts are cached
+# per graph, so another algorithm on the same input keeps the picture.
+# Graphs with more than max_nodes nodes (20k by default, a few seconds
+# of layout) get a quick pass instead: QUICK_LAYOUT_ITERATIONS rounds, pulling
+# only along the MST when there is one.
+LAYOUTS = ("force", "mst", "circle")
+FORCE_LAYOUT_MAX_NODES = 20000
+QUICK_LAYOUT_ITERATIONS = 5
+
+
+def node_positions(nodes, edges, mst_edges=(), layout="force", max_nodes=FORCE_LAYOUT_MAX_NODES):
+    if layout == "circle":
+        return layout_nodes_circle(nodes, radius=1.0)
+    if len(nodes) > max_nodes:
+        return cached_force_layout(nodes, edges, mst_edges=list(mst_edges) or None,
+                                   iterations=QUICK_LAYOUT_ITERATIONS)
+    if layout == "mst":
+        return cached_force_layout(nodes, edges, mst_edges=list(mst_edges))
+    return cached_force_layout(nodes, edges)
+
+
+def non_mst_edge_ids(graph, mst_edges):
+    # ids of the graph's edges that aren't in mst_edges; each MST edge claims
+    # exactly one matching graph edge, so identical parallel edges still count
+    index = graph.index
+    n = graph.num_nodes
+    wanted = Counter()
+    for u, v, w in mst_edges:
+        a, b = index[u], index[v]
+        wanted[(min(a, b), max(a, b), w)] += 1
+
+    lo = np.minimum(graph.src, graph.dst).astype(np.int64)
+    hi = np.maximum(graph.src, graph.dst).astype(np.int64)
+    pairs = np.fromiter((a * n + b for a, b, _ in wanted), dtype=np.int64, count=len(wanted))
+    candidates = np.nonzero(np.isin(lo * n + hi, pairs))[0]
+
+    keep = np.ones(graph.num_edges, dtype=bool)
+    for i, a, b, w in zip(candidates.tolist(), lo[candidates].tolist(), hi[candidates].tolist(),
+                          graph.weight[candidates].tolist()):
+        if wanted[(a, b, w)]:
+            wanted[(a, b, w)] -= 1
+            keep[i] = False
+    return np.nonzero(keep)[0]
+
+
+def _mst_keys(mst_edges):
+    # both orientations, so membership is one set lookup per edge
+    keys = set()
+    for u, v, w in mst_edges:
+        keys.add((u, v, w))
+        keys.add((v, u, w))
+    return keys
+
+
+def _segments(positions, edges):
+    return np.array([(positions[u], positions[v]) for u, v, _ in edges]).reshape(-1, 2, 2)
+
+
+def draw_graph2(ax, nodes, edges, mst_edges, layout="force"):
     ax.clear()
     ax.set_axis_off()
-    positions = layout_nodes_circle(nodes, radius=1.0)
+    positions = node_positions(nodes, edges, mst_edges, layout)
+    mst_keys = _mst_keys(mst_edges)
 
-    for u, v, w in edges:
-        if (u, v, w) in mst_edges or (v, u, w) in mst_edges:
-            continue
-        x1, y1 = positions[u]
-        x2, y2 = positions[v]
-        ax.plot([x1, x2], [y1, y2], linewidth=1, alpha=0.6)
+    # one ax.plot per line used to walk the colour cycle; keep that look
+    palette = rcParams['axes.prop_cycle'].by_key()['color']
 
-    for u, v, w in mst_edges:
-        x1, y1 = positions[u]
-        x2, y2 = positions[v]
-        ax.plot([x1, x2], [y1, y2], linewidth=3)
+    regular = [e for e in edges if e not in mst_keys]
+    k = len(regular)
+    ax.add_collection(LineCollection(_segments(positions, regular), linewidths=1, alpha=0.6,
+                                     colors=[palette[i % len(palette)] for i in range(k)]))
+    ax.add_collection(LineCollection(_segments(positions, mst_edges), linewidths=3,
+                                     colors=[palette[(k + i) % len(palette)] for i in range(len(mst_edges))]))
+    k += len(mst_edges)
 
+    xy = np.array([positions[node] for node in nodes]).reshape(-1, 2)
+    ax.scatter(xy[:, 0], xy[:, 1], s=64, zorder=2,
+               color=[palette[(k + i) % len(palette)] for i in range(len(nodes))])
     for node in nodes:
         x, y = positions[node]
-        ax.plot(x, y, marker='o', markersize=8)
         ax.text(x, y, f" {node}", fontsize=9, va='center')
 
-    ax.relim()
     ax.autoscale_view()
 
-def draw_graph(ax, nodes, edges, mst_edges):
+# Level-of-detail thresholds for draw_graph. Past each limit one kind of
+# detail is dropped; the MST itself is always drawn in full.
+LOD_DEFAULTS = {
+    "weight_labels": 150,   # max edges that still get weight labels
+    "node_labels": 200,     # max nodes that still get name labels
+    "thick_mst": 200,       # max MST edges still drawn with thick lines
+    "fade_edges": 1000,     # more edges than this: non-MST edges faded
+    "max_edges": 5000,      # non-MST edges beyond this are sampled
+}
+
+
+def draw_graph(ax, nodes, edges, mst_edges, lod=None, hidden_edges=0, layout="force", positions=None):
+    # hidden_edges: edges the caller already left out of `edges`, reported in
+    # the simplification note. positions: precomputed {node: (x, y)}, e.g.
+    # from node_positions on a worker thread. Returns the list of
+    # simplifications applied.
+    lod = dict(LOD_DEFAULTS, **(lod or {}))
     ax.clear()
     ax.set_axis_off()
-    positions = layout_nodes_circle(nodes, radius=1.0)
+    if positions is None:
+        positions = node_positions(nodes, edges, mst_edges, layout)
+    mst_keys = _mst_keys(mst_edges)
+    notes = []
     
     edge_color = 'gray'
-    
-    for u, v, w in edges:
-        x1, y1 = positions[u]
-        x2, y2 = positions[v]
-
-        if (u, v, w) in mst_edges or (v, u, w) in mst_edges:
-            lw = 3
-            ls = '-'  
-        else:
-            lw = 1
-            ls = ':'
-        ax.plot([x1, x2], [y1, y2], color=edge_color, linewidth=lw, linestyle=ls, alpha=0.8)
-        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-        ax.text(mx, my, str(w), fontsize=8, color='black', ha='center', va='center')
 
-    for node in nodes:
-        x, y = positions[node]
-        ax.plot(x, y, marker='o', markersize=8, color='skyblue')
-        ax.text(x, y, f" {node}", fontsize=9, va='center')
+    in_mst = [e in mst_keys for e in edges]
+    regular = [e for e, hit in zip(edges, in_mst) if not hit]
+    tree = [e for e, hit in zip(edges, in_mst) if hit]
+    num_regular = len(regular) + hidden_edges
+    if len(regular) > lod["max_edges"]:
+        pick = np.random.default_rng(0).choice(len(regular), lod["max_edges"], replace=False)
+        regular = [regular[i] for i in np.sort(pick).tolist()]
+    if len(regular) < num_regular:
+        notes.append(f"{len(regular)} of {num_regular} non-MST edges shown")
 
-    ax.relim()
-    ax.autoscale_view()
+    alpha = 0.8
+    if len(edges) + hidden_edges > lod["fade_edges"]:
+        alpha = 0.25
+        notes.append("non-MST edges faded")
+
+    ax.add_collection(LineCollection(_segments(positions, regular), colors=edge_color,
+                                     linewidths=1, linestyles=':', alpha=alpha))
+    # the MST is always drawn in full, just thinner once it would cover the
+    # canvas
+    ax.add_collection(LineCollection(_segments(positions, tree), colors=edge_color,
+                                     linewidths=3 if len(tree) <= lod["thick_mst"] else 0.8,
+                                     linestyles='-', alpha=0.8))
 
+    if len(edges) + hidden_edges <= lod["weight_labels"]:
+        for u, v, w in edges:
+            x1, y1 = positions[u]
+            x2, y2 = positions[v]
+            mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+            ax.text(mx, my, str(w), fontsize=8, color='black', ha='center', va='center')
+    else:
+        notes.append("weight labels hidden")
 
+    label_nodes = len(nodes) <= lod["node_labels"]
+    xy = np.array([positions[node] for node in nodes]).reshape(-1, 2)
+    ax.scatter(xy[:, 0], xy[:, 1], s=64 if label_nodes else 9, color='skyblue', zorder=2)
+    if label_nodes:
+        for node in nodes:
+            x, y = positions[node]
+            ax.text(x, y, f" {node}", fontsize=9, va='center')
+    else:
+        notes.append("node labels hidden")
+    if layout != "circle" and len(nodes) > FORCE_LAYOUT_MAX_NODES:
+        notes.append("quick layout (too many nodes)")
+
+    if notes:
+        ax.text(0.01, 0.01, "Simplified:\n" + "\n".join(notes), transform=ax.transAxes,
+                fontsize=7, color='dimgray', ha='left', va='bottom')
+
+    ax.autoscale_view()
+    return notes